@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+여러 파일/폴더를 프로세스 풀로 병렬 변환하는 일괄 처리 모드.
+큰 파일은 줄 경계에서 여러 조각으로 나누어 동시에 변환한 뒤 순서대로 이어 붙입니다.
+"""
+import codecs
+import csv
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import textfile
+from converter import SEPARATORS
+
+# 출력 파일 이름 형식: {stem} 원본 이름(확장자 제외), {ext} 확장자, {name} 원본 이름, {op} 변환 종류
+DEFAULT_NAME_TEMPLATE = "{stem}_{op}{ext}"
+# 이보다 큰 파일은 줄 경계에서 나누어 병렬로 변환 (바이트)
+DEFAULT_PART_SIZE = 64 << 20
+# 폴더를 입력으로 주었을 때 변환할 파일 패턴
+DEFAULT_PATTERN = "*.txt"
+# 출력 파일이 이미 있을 때: 건너뛰기 / 덮어쓰기 / 실패 처리
+OVERWRITE_POLICIES = ('skip', 'overwrite', 'fail')
+# 조각 결과를 이어 붙일 때 복사 단위 (바이트)
+COPY_SIZE = 1 << 20
+
+
+def is_ascii_compatible(encoding: str) -> bool:
+    # '\n' 이 그대로 한 바이트로 인코딩되면 줄 경계를 바이트 단위로 찾을 수 있습니다.
+    # (UTF-8, CP949, EUC-KR 은 다중 바이트 문자 안에 0x0A 가 나오지 않습니다.)
+    return '\n'.encode(textfile.continuation_encoding(encoding)) == b'\n'
+
+
+def expand_inputs(paths, pattern: str = DEFAULT_PATTERN, missing: list = None):
+    """
+    파일, 글롭 패턴, 폴더를 (입력 파일, 출력 폴더 기준 상대 경로) 목록으로 펼칩니다.
+    폴더는 하위 폴더까지 pattern 에 맞는 파일을 찾고 폴더 구조를 유지합니다.
+    missing 을 주면 파일을 하나도 찾지 못한 경로를 거기에 덧붙입니다.
+    """
+    found = []
+    for path in paths:
+        before = len(found)
+        if os.path.isdir(path):
+            for src in sorted(glob.glob(os.path.join(path, '**', pattern), recursive=True)):
+                if os.path.isfile(src):
+                    found.append((src, os.path.relpath(src, path)))
+        elif os.path.isfile(path):
+            found.append((path, os.path.basename(path)))
+        else:
+            for src in sorted(glob.glob(path, recursive=True)):
+                if os.path.isfile(src):
+                    found.append((src, os.path.basename(src)))
+        if missing is not None and len(found) == before:
+            missing.append(path)
+    # 같은 파일이 여러 번 지정되면 한 번만 변환
+    seen = set()
+    unique = []
+    for src, rel in found:
+        key = os.path.abspath(src)
+        if key not in seen:
+            seen.add(key)
+            unique.append((src, rel))
+    return unique
+
+
+def check_name_template(name_template: str):
+    # 출력 이름 형식에 모르는 항목이나 잘못된 중괄호가 있으면 ValueError
+    try:
+        name_template.format(stem='a', ext='.txt', name='a.txt', op='merge')
+    except (KeyError, IndexError, AttributeError, ValueError) as e:
+        raise ValueError(f"출력 이름 형식이 잘못되었습니다: {name_template} ({e!r})") from None
+
+
+def output_path(src: str, rel: str, operation: str, output_dir: str = None,
+                name_template: str = DEFAULT_NAME_TEMPLATE) -> str:
+    name = os.path.basename(src)
+    stem, ext = os.path.splitext(name)
+    out_name = name_template.format(stem=stem, ext=ext, name=name, op=operation)
+    if output_dir is None:
+        return os.path.join(os.path.dirname(src), out_name)
+    return os.path.join(output_dir, os.path.dirname(rel), out_name)
+
+
+def without_outputs(found, output_dir: str = None, name_template: str = DEFAULT_NAME_TEMPLATE,
+                    exclude=()):
+    """
+    expand_inputs 결과에서 출력 파일을 뺍니다. 어느 변환 종류로든, 출력 폴더나 입력 옆에
+    변환했을 때 나오는 이름이면 이전 실행의 출력으로 보아 다시 변환하지 않습니다.
+    exclude 의 경로도 함께 뺍니다.
+    """
+    outputs = {os.path.abspath(output_path(src, rel, op, folder, name_template))
+               for src, rel in found
+               for op in SEPARATORS
+               for folder in {output_dir, None}}
+    outputs.update(os.path.abspath(path) for path in exclude)
+    return [(src, rel) for src, rel in found if os.path.abspath(src) not in outputs]
+
+
+def split_points(path: str, size: int, part_size: int, encoding: str):
+    # 파일을 약 part_size 바이트씩, 줄바꿈 바로 다음 위치에서 나눈 (시작, 끝) 목록
+    if size <= part_size or not is_ascii_compatible(encoding):
+        return [(0, size)]
+    ranges = []
+    start = 0
+    with open(path, 'rb') as f:
+        while start + part_size < size:
+            f.seek(start + part_size)
+            pos = f.tell()
+            boundary = size
+            while True:
+                block = f.read(1 << 16)
+                if not block:
+                    break
+                i = block.find(b'\n')
+                if i >= 0:
+                    boundary = pos + i + 1
+                    break
+                pos += len(block)
+            ranges.append((start, boundary))
+            start = boundary
+    if start < size:
+        ranges.append((start, size))
+    return ranges
+
+
+def convert_range(src: str, dst: str, operation: str, encoding: str,
+                  output_encoding: str, start: int, end: int):
+    """
+    src 의 [start, end) 바이트를 변환하여 dst 에 씁니다. (작업 프로세스에서 실행)
+    (출력 바이트 수, 걸린 시간) 을 돌려줍니다.
+    """
+    result = textfile.convert_file(src, dst, operation, encoding, output_encoding, start, end)
+    return result['bytes_written'], result['seconds']
+
+
+def _stitch(parts, dst: str, separator: bytes, bom: bytes = b''):
+    """
+    조각별 결과 파일을 구분자로 이어 dst 하나로 만듭니다. 빈 결과는 건너뜁니다.
+    첫 조각의 결과가 비어 있으면 BOM 이 빠지므로, 그때는 처음 쓰는 조각 앞에 bom 을 씁니다.
+    """
+    with open(dst, 'wb') as out:
+        first = True
+        for i, (part, written) in enumerate(parts):
+            if not written:
+                continue
+            if not first:
+                out.write(separator)
+            elif i:
+                out.write(bom)
+            first = False
+            with open(part, 'rb') as f:
+                shutil.copyfileobj(f, out, COPY_SIZE)
+
+
+def _file_mode() -> int:
+    # open() 으로 새로 만든 파일의 권한 (mkstemp 는 항상 0600 으로 만듭니다)
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _FileTask:
+    # 파일 하나의 변환 상태 (조각별 결과를 모아 완료 시 합칩니다)
+    def __init__(self, src: str, dst: str, ranges, encoding: str, output_encoding: str):
+        self.src = src
+        self.dst = dst
+        self.encoding = encoding
+        self.output_encoding = output_encoding
+        self.bytes_in = ranges[-1][1] if ranges else 0
+        self.ranges = ranges
+        self.parts = [None] * len(ranges)   # (임시 파일, 출력 바이트 수)
+        self.temps = []
+        self.remaining = len(ranges)
+        self.seconds = 0.0
+        self.error = None
+
+    def temp_path(self) -> str:
+        fd, path = tempfile.mkstemp(prefix='.' + os.path.basename(self.dst) + '.',
+                                    suffix='.part', dir=os.path.dirname(self.dst) or '.')
+        os.close(fd)
+        self.temps.append(path)
+        return path
+
+    def finish(self, operation: str):
+        try:
+            if self.error is None:
+                began = time.perf_counter()
+                if len(self.parts) == 1:
+                    result = self.parts[0][0]
+                else:
+                    result = self.temp_path()
+                    separator = SEPARATORS[operation].encode(
+                        textfile.continuation_encoding(self.output_encoding))
+                    bom = (codecs.BOM_UTF8 if textfile.codec_name(self.output_encoding) == 'utf-8-sig'
+                           else b'')
+                    _stitch(self.parts, result, separator, bom)
+                # 임시 파일 권한(0600) 대신 직접 만든 파일과 같은 권한으로 둡니다.
+                os.chmod(result, _file_mode())
+                os.replace(result, self.dst)
+                self.seconds += time.perf_counter() - began
+        except OSError as e:
+            self.error = e
+        finally:
+            for path in self.temps:
+                _remove(path)
+        record = {
+            'input': self.src,
+            'output': self.dst,
+            'status': 'ok' if self.error is None else 'failed',
+            'parts': len(self.ranges),
+            'encoding': self.encoding,
+            'bytes_in': self.bytes_in,
+            'bytes_out': os.path.getsize(self.dst) if self.error is None else 0,
+            'seconds': round(self.seconds, 4),
+            'error': '' if self.error is None else str(self.error),
+        }
+        return record
+
+
+def _record(src: str, dst: str, status: str, error: str = ''):
+    return {'input': src, 'output': dst, 'status': status, 'parts': 0,
+            'encoding': '', 'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0, 'error': error}
+
+
+def run_batch(paths, operation: str, output_dir: str = None,
+              name_template: str = DEFAULT_NAME_TEMPLATE, if_exists: str = 'skip',
+              jobs: int = None, part_size: int = DEFAULT_PART_SIZE,
+              encoding: str = None, output_encoding: str = None,
+              pattern: str = DEFAULT_PATTERN, report=None):
+    """
+    paths 의 파일들을 operation 으로 변환합니다. 파일마다 요약 dict 를 돌려주며,
+    report 를 주면 파일 하나가 끝날 때마다 그 dict 로 호출합니다.
+    encoding 이 없으면 파일마다 감지하고, output_encoding 이 없으면 입력 인코딩으로 씁니다.
+    """
+    if if_exists not in OVERWRITE_POLICIES:
+        raise ValueError(f"알 수 없는 덮어쓰기 정책: {if_exists}")
+    report = report or (lambda record: None)
+    records = []
+
+    def done(record):
+        records.append(record)
+        report(record)
+
+    tasks = []
+    planned = set()
+    missing = []
+    found = expand_inputs(paths, pattern, missing)
+    for path in missing:
+        done(_record(path, '', 'failed', "입력 파일을 찾을 수 없습니다."))
+    for src, rel in without_outputs(found, output_dir, name_template):
+        dst = output_path(src, rel, operation, output_dir, name_template)
+        key = os.path.abspath(dst)
+        if key == os.path.abspath(src) or key in planned:
+            done(_record(src, dst, 'failed', "출력 파일 이름이 입력 또는 다른 출력과 겹칩니다."))
+            continue
+        if os.path.exists(dst) and if_exists != 'overwrite':
+            if if_exists == 'skip':
+                done(_record(src, dst, 'skipped', "출력 파일이 이미 있습니다."))
+            else:
+                done(_record(src, dst, 'failed', "출력 파일이 이미 있습니다."))
+            continue
+        planned.add(key)
+        try:
+            os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+            src_encoding = encoding or textfile.sniff_encoding(src)
+            ranges = split_points(src, os.path.getsize(src), part_size, src_encoding)
+        except OSError as e:
+            done(_record(src, dst, 'failed', str(e)))
+            continue
+        tasks.append(_FileTask(src, dst, ranges, src_encoding, output_encoding or src_encoding))
+
+    if not tasks:
+        return records
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        for task in tasks:
+            for i, (start, end) in enumerate(task.ranges):
+                try:
+                    part = task.temp_path()
+                except OSError as e:
+                    task.error = e
+                    task.remaining -= 1
+                    continue
+                future = pool.submit(convert_range, task.src, part, operation,
+                                     task.encoding, task.output_encoding, start, end)
+                futures[future] = (task, i, part)
+            if task.remaining == 0:
+                done(task.finish(operation))
+        for future in as_completed(futures):
+            task, i, part = futures.pop(future)
+            try:
+                written, seconds = future.result()
+                task.parts[i] = (part, written)
+                task.seconds += seconds
+            except Exception as e:
+                task.error = task.error or e
+            task.remaining -= 1
+            if task.remaining == 0:
+                done(task.finish(operation))
+    return records
+
+
+SUMMARY_FIELDS = ('input', 'output', 'status', 'parts', 'encoding',
+                  'bytes_in', 'bytes_out', 'seconds', 'error')
+
+
+def write_summary(records, path: str):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def print_record(record, file=sys.stdout):
+    line = f"[{record['status']}] {record['input']} -> {record['output']}"
+    if record['status'] == 'ok':
+        line += f" ({record['bytes_in']} -> {record['bytes_out']} bytes, {record['seconds']:.3f}s)"
+    elif record['error']:
+        line += f" : {record['error']}"
+    print(line, file=file, flush=True)
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+변환기 벤치마크.
+
+    python bench.py                          # 기본 크기(1K ~ 16M)로 측정
+    python bench.py --sizes 1K,1M,256M,1G    # 크기 지정
+    python bench.py --save base.json         # 결과 저장
+    python bench.py --baseline base.json     # 저장한 결과보다 나빠지면 종료 코드 1
+
+말뭉치는 종류별로 임시 폴더에 한 번 만들어 두고, 측정은 하나씩 별도 프로세스에서
+실행하여 처리량(MB/s)과 최대 메모리(peak RSS)를 따로 잽니다.
+측정마다 --repeat 번 이상(빨리 끝나면 더 많이) 실행하여 가장 좋은 값을 씁니다.
+(한 번만 재면 잡음으로 회귀 검사가 흔들립니다.)
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import textfile
+from converter import (
+    STREAM_CONVERTERS,
+    merge_sentences_to_paragraph,
+    read_chunks,
+    split_paragraph_to_sentences,
+)
+
+DEFAULT_SIZES = "1K,64K,1M,16M"
+# 이보다 큰 입력은 전체를 str 로 읽는 기존 함수(whole)로는 측정하지 않습니다.
+DEFAULT_WHOLE_LIMIT = "256M"
+# 기준 결과와 비교할 때 허용하는 비율 (0.2 = 20% 까지 나빠져도 통과)
+DEFAULT_THRESHOLD = 0.2
+# 이보다 작은 입력은 측정 오차가 커서 처리량 비교에서 제외합니다.
+DEFAULT_MIN_CHECK_SIZE = "16M"
+# 측정 하나를 반복하는 최소 횟수
+DEFAULT_REPEAT = 5
+# 빨리 끝나는 측정은 걸린 시간의 합이 이만큼 될 때까지 더 반복합니다. (초, 최대 MAX_REPEAT 번)
+MIN_MEASURE_SECONDS = 1.0
+MAX_REPEAT = 50
+# 메모리 비교에서 무시하는 차이 (바이트)
+MEMORY_SLACK = 8 << 20
+
+WHOLE_FUNCTIONS = {
+    'merge': merge_sentences_to_paragraph,
+    'split': split_paragraph_to_sentences,
+}
+METHODS = ('whole', 'stream', 'mmap')
+OPERATIONS = ('merge', 'split')
+
+_KO_WORDS = ("오늘은", "날씨가", "정말", "좋은", "하루", "문단을", "문장으로", "나누는", "변환기",
+             "테스트", "결과를", "확인했습니다", "그리고", "다음", "회의에서", "이야기", "해", "봐요")
+_KO_ENDINGS = ("다.", "요.", "요?", "죠!", "니다.", "까?")
+_EN_WORDS = ("the", "quick", "brown", "fox", "Dr.", "U.S.", "version", "3.14", "e.g.", "API")
+_CJK_WORDS = ("日本語", "テキスト", "中文", "文本", "変換", "測試")
+
+
+def _ko_sentence(rng):
+    words = rng.choices(_KO_WORDS, k=rng.randint(3, 12))
+    return ' '.join(words) + rng.choice(_KO_ENDINGS)
+
+
+def _gen_korean(rng):
+    return ' '.join(_ko_sentence(rng) for _ in range(rng.randint(1, 3))) + '\n'
+
+
+def _gen_mixed(rng):
+    pool = _KO_WORDS + _EN_WORDS + _CJK_WORDS + ("2024년", "10.5%", "“인용”", "(괄호)", "😀")
+    return ' '.join(rng.choices(pool, k=rng.randint(4, 16))) + rng.choice(".?!") + '\n'
+
+
+def _gen_crlf(rng):
+    return _gen_korean(rng)[:-1] + '\r\n'
+
+
+def _gen_whitespace(rng):
+    runs = (" ", "  ", "\t", " \t  ", "    ", "　", "\xa0")
+    words = rng.choices(_KO_WORDS + _EN_WORDS, k=rng.randint(2, 10))
+    return rng.choice(runs) + ''.join(w + rng.choice(runs) for w in words) + '\n'
+
+
+def _gen_blank_lines(rng):
+    blanks = ''.join(rng.choice(("\n", " \n", "\t\n", "\r\n")) for _ in range(rng.randint(1, 6)))
+    return _ko_sentence(rng) + '\n' + blanks
+
+
+CORPORA = {
+    'korean': _gen_korean,
+    'mixed': _gen_mixed,
+    'crlf': _gen_crlf,
+    'whitespace': _gen_whitespace,
+    'blank-lines': _gen_blank_lines,
+}
+# 말뭉치를 만들 때 반복해서 쓰는 블록 크기 (글자)
+BLOCK_CHARS = 1 << 18
+
+
+def parse_size(text: str) -> int:
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    text = text.strip().upper().rstrip('B')
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def format_size(size: int) -> str:
+    for unit, scale in (('G', 1 << 30), ('M', 1 << 20), ('K', 1 << 10)):
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}"
+    return str(size)
+
+
+def make_corpus(kind: str, size: int, path: str, seed: int = 0):
+    # kind 종류의 UTF-8 텍스트를 size 바이트만큼 만듭니다. (블록을 반복하고 끝은 글자 단위로 자름)
+    rng = random.Random(f"{kind}-{seed}")
+    generate = CORPORA[kind]
+    parts = []
+    length = 0
+    while length < BLOCK_CHARS:
+        line = generate(rng)
+        parts.append(line)
+        length += len(line)
+    block = ''.join(parts).encode('utf-8')
+    with open(path, 'wb') as f:
+        remaining = size
+        while remaining >= len(block):
+            f.write(block)
+            remaining -= len(block)
+        tail = block[:remaining].decode('utf-8', 'ignore').encode('utf-8')
+        f.write(tail)
+
+
+def peak_rss():
+    # 현재 프로세스의 최대 메모리 사용량 (바이트). 측정할 수 없으면 None.
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_method(method: str, operation: str, src: str, dst: str):
+    if method == 'whole':
+        with open(src, encoding='utf-8', newline='') as f:
+            text = f.read()
+        with open(dst, 'w', encoding='utf-8', newline='') as f:
+            f.write(WHOLE_FUNCTIONS[operation](text))
+    elif method == 'stream':
+        with open(src, encoding='utf-8', newline='') as f, \
+             open(dst, 'w', encoding='utf-8', newline='') as out:
+            for piece in STREAM_CONVERTERS[operation](read_chunks(f)):
+                out.write(piece)
+    elif method == 'mmap':
+        textfile.convert_file(src, dst, operation, 'utf-8')
+    else:
+        raise ValueError(f"알 수 없는 측정 방법: {method}")
+
+
+def child_main(method: str, operation: str, src: str, dst: str):
+    began = time.perf_counter()
+    run_method(method, operation, src, dst)
+    seconds = time.perf_counter() - began
+    print(json.dumps({'seconds': seconds, 'peak_rss': peak_rss()}))
+    return 0
+
+
+def measure(method: str, operation: str, src: str, dst: str):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', method, operation, src, dst],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout)
+
+
+def measure_best(method: str, operation: str, src: str, dst: str, repeat: int = DEFAULT_REPEAT):
+    # 여러 번 측정하여 가장 짧은 시간과 가장 작은 최대 메모리를 씁니다.
+    # 다른 프로세스나 디스크 캐시 때문에 생기는 잡음은 값을 나쁘게만 만들기 때문입니다.
+    runs = []
+    while len(runs) < max(1, repeat) or (
+            sum(m['seconds'] for m in runs) < MIN_MEASURE_SECONDS and len(runs) < MAX_REPEAT):
+        runs.append(measure(method, operation, src, dst))
+    peaks = [m['peak_rss'] for m in runs if m['peak_rss']]
+    return {'seconds': min(m['seconds'] for m in runs), 'peak_rss': min(peaks) if peaks else None}
+
+
+def run_suite(kinds, sizes, methods, operations, whole_limit: int, workdir: str, report=None,
+              repeat: int = DEFAULT_REPEAT):
+    results = {}
+    for kind in kinds:
+        for size in sizes:
+            src = os.path.join(workdir, f"{kind}-{format_size(size)}.txt")
+            dst = os.path.join(workdir, "out.txt")
+            make_corpus(kind, size, src)
+            for method in methods:
+                if method == 'whole' and size > whole_limit:
+                    continue
+                for operation in operations:
+                    m = measure_best(method, operation, src, dst, repeat)
+                    seconds = max(m['seconds'], 1e-9)
+                    record = {
+                        'kind': kind, 'size': size, 'method': method, 'operation': operation,
+                        'seconds': seconds,
+                        'mb_per_s': size / (1 << 20) / seconds,
+                        'peak_rss': m['peak_rss'],
+                    }
+                    key = f"{kind}/{format_size(size)}/{method}/{operation}"
+                    results[key] = record
+                    if report:
+                        report(key, record)
+            os.remove(src)
+    return results
+
+
+def compare(results, baseline, threshold: float, min_check_size: int):
+    # 기준 결과보다 처리량이 줄거나 메모리가 늘어난 항목 목록
+    problems = []
+    for key, record in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if record['size'] >= min_check_size and record['mb_per_s'] < base['mb_per_s'] * (1 - threshold):
+            problems.append(f"{key}: 처리량 {base['mb_per_s']:.1f} -> {record['mb_per_s']:.1f} MB/s")
+        if record['peak_rss'] and base.get('peak_rss'):
+            limit = base['peak_rss'] * (1 + threshold) + MEMORY_SLACK
+            if record['peak_rss'] > limit:
+                problems.append(f"{key}: 최대 메모리 {base['peak_rss'] >> 20} -> "
+                                f"{record['peak_rss'] >> 20} MB")
+    return problems
+
+
+def print_record(key: str, record):
+    peak = f"{record['peak_rss'] >> 20:6d} MB" if record['peak_rss'] else "     - MB"
+    print(f"{key:40s} {record['mb_per_s']:9.1f} MB/s {record['seconds']:9.4f}s {peak}", flush=True)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="bench.py", description="변환기 벤치마크")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="입력 크기 목록 (기본값: %(default)s)")
+    parser.add_argument("--kinds", default=','.join(CORPORA),
+                        help="말뭉치 종류 (기본값: %(default)s)")
+    parser.add_argument("--methods", default=','.join(METHODS),
+                        help="측정할 방법: whole(기존 함수), stream(스트리밍), mmap(파일 매핑)")
+    parser.add_argument("--operations", default=','.join(OPERATIONS))
+    parser.add_argument("--whole-limit", default=DEFAULT_WHOLE_LIMIT,
+                        help="whole 방법으로 측정할 최대 크기 (기본값: %(default)s)")
+    parser.add_argument("--workdir", help="말뭉치를 만들 폴더 (기본값: 임시 폴더)")
+    parser.add_argument("--save", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="허용하는 성능 저하 비율 (기본값: %(default)s)")
+    parser.add_argument("--min-check-size", default=DEFAULT_MIN_CHECK_SIZE,
+                        help="처리량을 비교할 최소 입력 크기 (기본값: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="측정마다 반복 실행하여 가장 좋은 값을 쓸 횟수 (기본값: %(default)s)")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['--child']:
+        return child_main(*argv[1:5])
+    args = build_parser().parse_args(argv)
+    if args.repeat <= 0:
+        print("--repeat 은 1 이상이어야 합니다.", file=sys.stderr)
+        return 2
+    kinds, methods, operations = (args.kinds.split(','), args.methods.split(','),
+                                  args.operations.split(','))
+    for label, values, known in (("말뭉치 종류", kinds, CORPORA), ("측정 방법", methods, METHODS),
+                                 ("변환 종류", operations, OPERATIONS)):
+        unknown = [v for v in values if v not in known]
+        if unknown:
+            print(f"알 수 없는 {label}: {', '.join(unknown)} (가능한 값: {', '.join(known)})",
+                  file=sys.stderr)
+            return 2
+    try:
+        sizes = [parse_size(s) for s in args.sizes.split(',')]
+        whole_limit = parse_size(args.whole_limit)
+        min_check_size = parse_size(args.min_check_size)
+    except ValueError as e:
+        print(f"잘못된 크기: {e}", file=sys.stderr)
+        return 2
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="textconverter-bench-")
+    try:
+        results = run_suite(
+            kinds,
+            sizes,
+            methods,
+            operations,
+            whole_limit,
+            workdir,
+            report=print_record,
+            repeat=args.repeat,
+        )
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline, args.threshold, min_check_size)
+        for problem in problems:
+            print(f"[회귀] {problem}")
+        if problems:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+텍스트 변환 함수 모음.
+GUI(tkinter) 없이도 import 할 수 있도록 main.py 에서 분리했습니다.
+"""
+import re
+
+# 스트리밍 변환 시 한 번에 읽어들이는 문자 수
+CHUNK_SIZE = 1 << 16
+
+# splitlines() 가 줄바꿈으로 취급하는 문자들 (\r\n 은 한 줄바꿈).
+# bytes.splitlines() 는 \n, \r 만 나누므로 bytes 입력에는 다른 줄바꿈이 없어야 합니다 (textfile.py 참고).
+_LINE_BREAKS = frozenset('\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029')
+_LINE_BREAKS_BYTES = frozenset((b'\n', b'\r'))
+
+# 스트리밍 변환기에서 쓰는 상수들: (빈 값, 공백, 문단 구분자, '\r', 줄바꿈 문자들)
+_TOKENS = {
+    str: ('', ' ', '\n\n', '\r', _LINE_BREAKS),
+    bytes: (b'', b' ', b'\n\n', b'\r', _LINE_BREAKS_BYTES),
+}
+
+
+# 1번 기능: 여러 줄 -> 한 문단
+def merge_sentences_to_paragraph(text: str) -> str:
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    paragraph = ' '.join(lines)
+    return re.sub(r"\s+", " ", paragraph)
+
+# 2번 기능: 문단 -> 문장별 줄바꿈
+def split_paragraph_to_sentences(text: str) -> str:
+    """
+    입력 텍스트에서 기존 줄을 그대로 유지하고,
+    각 줄 사이에 빈 줄 한 줄을 추가합니다.
+    """
+    # 1) 원본 텍스트를 줄 단위로 분리
+    lines = text.splitlines()
+    # 2) 빈 줄이 아닌 행만 필터링
+    lines = [line for line in lines if line.strip()]
+    # 3) 각 줄 사이에 빈 줄을 추가하여 결합
+    return "\n\n".join(lines)
+
+
+def read_chunks(f, size: int = CHUNK_SIZE):
+    # 파일 객체에서 size 글자씩 읽어 돌려줍니다.
+    while True:
+        chunk = f.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+# 1번 기능 스트리밍 버전: 청크 단위로 입력을 받아 결과 조각을 바로 내보냅니다.
+def iter_merge_sentences_to_paragraph(chunks):
+    """
+    merge_sentences_to_paragraph 와 같은 결과를 조각으로 나누어 돌려줍니다.
+    줄마다 strip 후 공백으로 잇고 연속 공백을 하나로 줄이는 것은
+    결국 공백 문자로 나눈 단어들을 ' ' 하나로 잇는 것과 같으므로,
+    청크 경계에서 단어가 잘렸는지만 기억하면 됩니다.
+    청크는 모두 str 이거나 모두 bytes 여야 합니다.
+    """
+    emitted = False   # 지금까지 단어를 하나라도 내보냈는지
+    pending = False   # 이전 청크가 공백으로 끝났는지
+    space = None
+    for chunk in chunks:
+        words = chunk.split()
+        if not words:
+            pending = pending or bool(chunk)
+            continue
+        if space is None:
+            space = _TOKENS[type(chunk)][1]
+        piece = space.join(words)
+        # 앞 청크의 마지막 단어와 이어지는 경우가 아니면 공백 하나로 구분
+        if emitted and (pending or chunk[:1].isspace()):
+            piece = space + piece
+        yield piece
+        emitted = True
+        pending = chunk[-1:].isspace()
+
+
+# 2번 기능 스트리밍 버전
+def iter_split_paragraph_to_sentences(chunks):
+    """
+    split_paragraph_to_sentences 와 같은 결과를 조각으로 나누어 돌려줍니다.
+    청크 경계에 걸친 줄, 아직 빈 줄인지 알 수 없는 줄 앞부분의 공백,
+    청크 끝의 '\\r' (다음 청크의 '\\n' 과 합쳐질 수 있음)을 상태로 유지합니다.
+    청크는 모두 str 이거나 모두 bytes 여야 합니다.
+    """
+    started = False   # 빈 줄이 아닌 줄을 하나라도 내보냈는지
+    visible = False   # 현재 줄이 빈 줄이 아님이 확인되어 이미 출력 중인지
+    head = []         # 현재 줄에서 아직 출력하지 않은 공백 부분
+    carry = None      # 청크 끝에 걸린 '\r'
+    empty = sep = cr = breaks = strip = None
+
+    def feed(segment):
+        # 현재 줄에 segment 를 이어 붙이고, 내보낼 문자열을 돌려줍니다.
+        nonlocal started, visible
+        if visible:
+            return segment
+        if not segment or segment.isspace():
+            head.append(segment)
+            return empty
+        out = (sep if started else empty) + empty.join(head) + segment
+        head.clear()
+        started = visible = True
+        return out
+
+    def end_line():
+        nonlocal visible
+        visible = False
+        head.clear()
+
+    for chunk in chunks:
+        if carry is None:
+            empty, _, sep, cr, breaks = _TOKENS[type(chunk)]
+            strip = type(chunk).strip
+            carry = empty
+        data = carry + chunk
+        carry = empty
+        if data.endswith(cr):
+            data, carry = data[:-1], cr
+        # parts[0] 은 이어지던 줄의 나머지, parts[-1] 은 새로 시작된 (아직 안 끝난) 줄
+        parts = data.splitlines()
+        if not parts or data[-1:] in breaks:
+            parts.append(empty)
+        out = [feed(parts[0])]
+        if len(parts) > 1:
+            end_line()
+            # 청크 안에서 완결된 줄들은 한 번에 처리
+            lines = list(filter(strip, parts[1:-1]))
+            if lines:
+                out.append((sep if started else empty) + sep.join(lines))
+                started = True
+            out.append(feed(parts[-1]))
+        piece = empty.join(out)
+        if piece:
+            yield piece
+    # 마지막에 남은 '\r' 은 줄 끝일 뿐이므로 출력할 내용이 없습니다.
+
+
+# 변환 종류별 스트리밍 변환기
+STREAM_CONVERTERS = {
+    'merge': iter_merge_sentences_to_paragraph,
+    'split': iter_split_paragraph_to_sentences,
+}
+
+# 변환 결과에서 줄(문장) 사이에 들어가는 구분자.
+# 줄 경계에서 나눈 입력 조각들의 결과는 이 구분자로 이어 붙이면 전체 결과와 같습니다.
+SEPARATORS = {'merge': ' ', 'split': '\n\n'}
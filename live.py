@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+실시간 미리보기용 증분 변환.
+입력 줄마다 변환 결과를 보관해 두고, 수정된 줄 범위만 다시 변환하여
+출력에서 바꿔야 할 구간만 계산합니다. tkinter 에 의존하지 않습니다.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from converter import SEPARATORS
+
+_FIELD = {'merge': 0, 'split': 1}
+# 입력 전체를 다시 변환해야 함을 나타내는 수정 범위 (record_edit 참고)
+FULL_REBUILD = object()
+# text_digest 가 한 번에 인코딩하는 글자 수
+DIGEST_CHUNK = 1 << 20
+
+
+def convert_line(line: str):
+    """
+    입력창 한 줄 -> (합치기용 조각, 공백추가용 조각).
+    빈 줄(공백뿐인 줄)이면 둘 다 '' 입니다.
+    """
+    merged = ' '.join(line.split())
+    if not merged:
+        return ('', '')
+    # 입력창은 '\n' 으로만 줄을 나누므로 '\r' 등 다른 줄바꿈도 여기서 처리
+    return (merged, "\n\n".join(p for p in line.splitlines() if p.strip()))
+
+
+def _region(items, sep: str, before: bool, after: bool) -> str:
+    # 출력에서 items 가 차지하는 부분. 앞/뒤 문장과의 구분자를 한쪽에 붙입니다.
+    if not items:
+        return ''
+    if after:
+        return ''.join(x + sep for x in items)
+    if before:
+        return ''.join(sep + x for x in items)
+    return sep.join(items)
+
+
+class LineIndex:
+    """
+    입력 줄별 변환 결과를 BLOCK_SIZE 줄 단위 블록으로 보관합니다.
+    블록마다 (빈 줄이 아닌 줄 수, 합치기 조각 길이 합, 공백추가 조각 길이 합)을
+    유지하므로 출력에서의 위치를 전체를 훑지 않고 계산할 수 있습니다.
+    """
+    BLOCK_SIZE = 1024
+
+    def __init__(self, lines=()):
+        self._blocks = []
+        self._stats = []
+        self._splice_blocks(0, 0, [convert_line(l) for l in lines])
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self._blocks)
+
+    @staticmethod
+    def _block_stats(block):
+        nonblank = [e for e in block if e[0]]
+        return (len(nonblank),
+                sum(len(e[0]) for e in nonblank),
+                sum(len(e[1]) for e in nonblank))
+
+    def _splice_blocks(self, bi: int, bj: int, entries):
+        # 블록 bi..bj-1 을 entries 로 다시 만듭니다.
+        size = self.BLOCK_SIZE
+        blocks = [entries[i:i + size] for i in range(0, len(entries), size)]
+        self._blocks[bi:bj] = blocks
+        self._stats[bi:bj] = [self._block_stats(b) for b in blocks]
+
+    def _locate(self, pos: int):
+        # pos 번째 줄이 들어 있는 블록 번호와 블록 시작 줄 번호
+        start = 0
+        for i, block in enumerate(self._blocks):
+            if pos < start + len(block):
+                return i, start
+            start += len(block)
+        return len(self._blocks), start
+
+    def _prefix(self, field: int, pos: int):
+        # pos 앞쪽 줄들의 (빈 줄이 아닌 줄 수, 조각 길이 합)
+        count = length = 0
+        bi, start = self._locate(pos)
+        for stats in self._stats[:bi]:
+            count += stats[0]
+            length += stats[1 + field]
+        if bi < len(self._blocks):
+            for e in self._blocks[bi][:pos - start]:
+                if e[0]:
+                    count += 1
+                    length += len(e[field])
+        return count, length
+
+    def render(self, operation: str) -> str:
+        field = _FIELD[operation]
+        return SEPARATORS[operation].join(
+            e[field] for block in self._blocks for e in block if e[0])
+
+    def replace(self, lo: int, hi: int, lines, operation: str = None):
+        """
+        lo..hi-1 번째 줄을 lines 로 바꿉니다.
+        operation 을 주면 그 변환 결과에서 바뀌는 구간을
+        (시작 위치, 지울 글자 수, 새로 넣을 문자열) 로 돌려줍니다.
+        """
+        new_entries = [convert_line(l) for l in lines]
+        bi, bstart = self._locate(lo)
+        bj, bend = self._locate(hi)
+        if bj < len(self._blocks):
+            bend += len(self._blocks[bj])
+            bj += 1
+        entries = [e for block in self._blocks[bi:bj] for e in block]
+        old_entries = entries[lo - bstart:hi - bstart]
+
+        patch = None
+        if operation is not None:
+            field = _FIELD[operation]
+            sep = SEPARATORS[operation]
+            count_before, len_before = self._prefix(field, lo)
+            old = [e[field] for e in old_entries if e[0]]
+            new = [e[field] for e in new_entries if e[0]]
+            count_after = sum(s[0] for s in self._stats) - count_before - len(old)
+            start = len_before + count_before * len(sep)
+            if count_before and not count_after:
+                # 마지막 문장들이 바뀌는 경우 앞 구분자부터 바꿉니다.
+                start -= len(sep)
+            old_text = _region(old, sep, count_before > 0, count_after > 0)
+            new_text = _region(new, sep, count_before > 0, count_after > 0)
+            patch = (start, len(old_text), new_text)
+
+        entries[lo - bstart:hi - bstart] = new_entries
+        self._splice_blocks(bi, bj, entries)
+        return patch
+
+
+def record_edit(dirty, line: int, old_count: int, new_count: int):
+    """
+    입력창 line 줄(1부터)부터 old_count+1 줄이 new_count+1 줄로 바뀐 것을
+    아직 반영하지 않은 수정 범위 dirty 에 합친 새 범위를 돌려줍니다.
+    범위는 (인덱스 시작 줄, 인덱스 끝 줄, 입력창 끝 줄) 이며 없으면 None,
+    전체를 다시 만들어야 하면 FULL_REBUILD 입니다.
+    """
+    a, b, b_new = line - 1, line + old_count, line + new_count
+    if dirty is FULL_REBUILD:
+        return dirty
+    if dirty is None:
+        return (a, b, b_new)
+    lo, old_hi, cur_hi = dirty
+    hi = max(cur_hi, b)
+    return (min(lo, a), hi - (cur_hi - old_hi), hi + (b_new - b))
+
+
+def text_digest(text: str) -> str:
+    # 큰 입력을 한 번에 인코딩하면 입력 크기의 몇 배인 임시 bytes 가 생기므로 나누어 해시합니다.
+    digest = hashlib.blake2b(digest_size=16)
+    for i in range(0, len(text), DIGEST_CHUNK):
+        digest.update(text[i:i + DIGEST_CHUNK].encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    (입력 해시, 변환 종류) -> 결과 문자열 을 보관하는 LRU 캐시.
+    항목 수와 결과 글자 수 합계 모두 상한을 둡니다.
+    변환 작업 스레드에서도 쓰므로 잠금으로 보호합니다.
+    """
+    def __init__(self, max_entries: int = 8, max_chars: int = 1 << 26):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._items = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            result = self._items.get(key)
+            if result is not None:
+                self._items.move_to_end(key)
+            return result
+
+    def put(self, key, result: str):
+        if len(result) > self.max_chars:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._chars -= len(old)
+            self._items[key] = result
+            self._chars += len(result)
+            while len(self._items) > self.max_entries or self._chars > self.max_chars:
+                _, dropped = self._items.popitem(last=False)
+                self._chars -= len(dropped)
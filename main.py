@@ -1,8 +1,91 @@
 #!/usr/bin/env python3
-import re
-import tkinter as tk
-from tkinter import messagebox, scrolledtext,filedialog
-import tkinter.font as tkfont
+import argparse
+import asyncio
+import codecs
+import io
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+
+import batch
+import pipeline
+import server
+import textfile
+import watch
+from converter import CHUNK_SIZE, STREAM_CONVERTERS, read_chunks
+from live import FULL_REBUILD, LineIndex, ResultCache, record_edit, text_digest
+from resultbuffer import ResultBuffer
+
+# GUI 작업 스레드가 한 번에 변환하는 글자 수 (진행률/취소 확인 단위)
+GUI_CHUNK_SIZE = 1 << 18
+# 작업 큐를 확인하는 주기 (ms)
+POLL_INTERVAL_MS = 50
+# 상태 표시줄에 쓰는 변환 이름
+OPERATION_LABELS = {'merge': "합치기", 'split': "공백추가"}
+
+
+class ConversionJob:
+    """
+    변환을 작업 스레드에서 실행하고 결과를 큐로 돌려줍니다.
+    큐 메시지: ('progress', 0~1 비율), ('done', ResultBuffer), ('cancelled', None), ('error', 예외)
+    cache 를 주면 입력 해시 계산과 캐시 확인도 작업 스레드에서 합니다.
+    """
+    def __init__(self, operation: str, text: str, chunk_size: int = GUI_CHUNK_SIZE,
+                 cache: ResultCache = None):
+        self.queue = queue.Queue()
+        self._operation = operation
+        self._text = text
+        self._chunk_size = chunk_size
+        self._cache = cache
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.seconds = 0.0   # 변환에 걸린 시간
+        self.cached = False  # 결과를 캐시에서 가져왔는지
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _chunks(self):
+        text, size = self._text, self._chunk_size
+        total = len(text) or 1
+        for i in range(0, len(text), size):
+            if self._cancel.is_set():
+                return
+            yield text[i:i + size]
+            self.queue.put(('progress', min(i + size, total) / total))
+
+    def _run(self):
+        began = time.perf_counter()
+        key = result = None
+        try:
+            if self._cache is not None:
+                key = (text_digest(self._text), self._operation)
+                result = self._cache.get(key)
+                self.cached = result is not None
+            if result is None:
+                result = ResultBuffer(STREAM_CONVERTERS[self._operation](self._chunks()))
+        except Exception as e:
+            self.queue.put(('error', e))
+            return
+        finally:
+            self._text = None
+            self.seconds = time.perf_counter() - began
+        if self._cancel.is_set():
+            self.queue.put(('cancelled', None))
+            return
+        if key is not None and not self.cached:
+            self._cache.put(key, result)
+        self.queue.put(('done', result))
 
 
 # 키보드 단축키 통합 처리: Ctrl/Command+키 regardless of IME mode
@@ -23,116 +106,606 @@ def handle_shortcut(event):
         event.widget.event_generate(action)
         return "break"
 
-# 1번 기능: 여러 줄 -> 한 문단
-def merge_sentences_to_paragraph(text: str) -> str:
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    paragraph = ' '.join(lines)
-    return re.sub(r"\s+", " ", paragraph)
 
-# 2번 기능: 문단 -> 문장별 줄바꿈
-def split_paragraph_to_sentences(text: str) -> str:
-    """
-    입력 텍스트에서 기존 줄을 그대로 유지하고,
-    각 줄 사이에 빈 줄 한 줄을 추가합니다.
-    """
-    # 1) 원본 텍스트를 줄 단위로 분리
-    lines = text.splitlines()
-    # 2) 빈 줄이 아닌 행만 필터링
-    lines = [line for line in lines if line.strip()]
-    # 3) 각 줄 사이에 빈 줄을 추가하여 결합
-    return "\n\n".join(lines)
-
-
-def on_merge():
-    input_text = input_box.get("1.0", tk.END)
-    if not input_text.strip():
-        messagebox.showwarning("입력 오류", "변환할 텍스트를 입력하세요.")
+def run_gui():
+    # tkinter 는 GUI 모드에서만 불러옵니다 (명령줄 모드는 tkinter 없이 동작).
+    import tkinter as tk
+    from tkinter import messagebox, scrolledtext,filedialog, ttk
+    import tkinter.font as tkfont
+    from viewer import ResultViewer
+
+    # busy: 변환/출력 중인지, job: 실행 중인 작업,
+    # index: 실시간 미리보기용 줄 인덱스 (꺼져 있으면 None),
+    # dirty: 아직 반영하지 않은 수정 범위 (인덱스 시작 줄, 인덱스 끝 줄, 입력창 끝 줄)
+    #        또는 전체를 다시 만들어야 하면 FULL_REBUILD
+    state = {'busy': False, 'job': None, 'operation': 'merge',
+             'index': None, 'dirty': None, 'flush_scheduled': False}
+    cache = ResultCache()
+
+    def set_busy(busy: bool):
+        # 변환 중에는 변환 버튼을 막고 취소 버튼만 활성화
+        state['busy'] = busy
+        for b in (merge_button, split_button, live_check):
+            b.config(state=tk.DISABLED if busy else tk.NORMAL)
+        cancel_button.config(state=tk.NORMAL if busy and state['job'] else tk.DISABLED)
+        if not busy:
+            progress['value'] = 0
+            state['job'] = None
+            schedule_flush()
+
+    def show_result(result, convert_seconds: float = 0.0, note: str = ''):
+        # 결과는 버퍼에 두고 보기 창은 보이는 부분만 그리므로 바로 끝납니다.
+        if isinstance(result, str):
+            result = ResultBuffer([result])
+        began = time.perf_counter()
+        output_view.set_buffer(result)
+        output_view.update_idletasks()
+        update_status(convert_seconds, time.perf_counter() - began, len(result), note)
+
+    def update_status(convert_seconds: float, render_seconds: float, output_chars: int, note: str = ''):
+        # 상태 표시줄: 변환 시간, 화면 표시 시간, 입력/출력 글자 수
+        if not show_status.get():
+            return
+        input_chars = input_box.count("1.0", "end-1c", "chars")
+        input_chars = input_chars[0] if input_chars else 0
+        status_var.set(
+            f"{OPERATION_LABELS[state['operation']]}{note}: "
+            f"변환 {convert_seconds * 1000:.1f} ms · 표시 {render_seconds * 1000:.1f} ms · "
+            f"입력 {input_chars:,}자 → 출력 {output_chars:,}자"
+        )
+
+    def start_conversion(operation: str):
+        if state['busy']:
+            return
+        state['operation'] = operation
+        input_text = input_box.get("1.0", tk.END)
+        if not input_text.strip():
+            messagebox.showwarning("입력 오류", "변환할 텍스트를 입력하세요.")
+            return
+        if state['index'] is not None:
+            # 실시간 미리보기 중에는 인덱스에서 바로 결과를 만듭니다.
+            began = time.perf_counter()
+            update_index()
+            result = state['index'].render(operation)
+            show_result(result, time.perf_counter() - began, " (실시간)")
+            return
+        # 입력 해시와 캐시 확인은 큰 입력에서 오래 걸리므로 작업 스레드에 맡깁니다.
+        job = ConversionJob(operation, input_text, cache=cache)
+        state['job'] = job
+        set_busy(True)
+        job.start()
+        root.after(POLL_INTERVAL_MS, poll_job, job)
+
+    def poll_job(job):
+        # 작업 스레드가 보낸 메시지를 처리 (Tk 위젯은 메인 스레드에서만 다룸)
+        while True:
+            try:
+                kind, value = job.queue.get_nowait()
+            except queue.Empty:
+                root.after(POLL_INTERVAL_MS, poll_job, job)
+                return
+            if kind == 'progress':
+                progress['value'] = value * 100
+            elif kind == 'done':
+                show_result(value, job.seconds, " (캐시)" if job.cached else '')
+                set_busy(False)
+                return
+            elif kind == 'cancelled':
+                set_busy(False)
+                return
+            elif kind == 'error':
+                set_busy(False)
+                messagebox.showerror("변환 실패", f"변환 중 오류가 발생했습니다:\n{value}")
+                return
+
+    def on_merge():
+        start_conversion('merge')
+
+    def on_split():
+        start_conversion('split')
+
+    def on_cancel():
+        if state['job'] is not None:
+            state['job'].cancel()
+
+    # --- 실시간 미리보기 ---
+
+    def rebuild_index(text=None):
+        if text is None:
+            text = input_box.get("1.0", tk.END)
+        # 입력창의 마지막 '\n' 은 위젯이 붙인 것이므로 제외
+        state['index'] = LineIndex(text[:-1].split('\n'))
+
+    def on_toggle_live():
+        if not live_var.get():
+            state['index'] = None
+            state['dirty'] = None
+            return
+        began = time.perf_counter()
+        rebuild_index()
+        state['dirty'] = None
+        if not state['busy']:
+            result = state['index'].render(state['operation'])
+            show_result(result, time.perf_counter() - began, " (실시간)")
+
+    def line_of(index: str) -> int:
+        return int(str(root.tk.call(input_orig, 'index', index)).split('.')[0])
+
+    def input_proxy(*args):
+        # 입력창의 insert/delete/replace 를 가로채 바뀐 줄 범위를 기록합니다.
+        edit = None
+        if state['index'] is not None and args and args[0] in ('insert', 'delete', 'replace'):
+            last = line_of('end-1c')
+            if args[0] == 'insert':
+                edit = (min(line_of(args[1]), last), 0,
+                        sum(str(t).count('\n') for t in args[2::2]))
+            elif len(args) <= 3 or args[0] == 'replace':
+                first = min(line_of(args[1]), last)
+                end = args[2] if len(args) > 2 else f"{args[1]}+1c"
+                texts = args[3::2] if args[0] == 'replace' else ()
+                edit = (first, max(min(line_of(end), last) - first, 0),
+                        sum(str(t).count('\n') for t in texts))
+            else:
+                # 여러 구간을 한 번에 지우는 경우는 전체를 다시 만듭니다.
+                state['dirty'] = FULL_REBUILD
+        result = root.tk.call((input_orig,) + args)
+        if edit is not None:
+            state['dirty'] = record_edit(state['dirty'], *edit)
+        return result
+
+    def on_input_modified(event):
+        input_box.edit_modified(False)
+        schedule_flush()
+
+    def schedule_flush():
+        if state['dirty'] is not None and not state['flush_scheduled']:
+            state['flush_scheduled'] = True
+            root.after_idle(flush_live)
+
+    def update_index(operation=None):
+        """
+        모아 둔 수정 범위의 줄만 다시 변환하여 인덱스에 반영합니다.
+        operation 을 주면 그 변환 결과에서 바뀌는 구간을 돌려주고,
+        전체를 다시 만들었으면 None 을 돌려줍니다.
+        """
+        index, dirty = state['index'], state['dirty']
+        state['dirty'] = None
+        if dirty is None:
+            return (0, 0, '')
+        if dirty is not FULL_REBUILD:
+            lo, old_hi, cur_hi = dirty
+            lines = input_box.get(f"{lo + 1}.0", f"{cur_hi}.end").split('\n')
+            patch = index.replace(lo, old_hi, lines, operation)
+            if len(index) == line_of('end-1c'):
+                return patch
+        # 인덱스가 입력창과 어긋나면 전체를 다시 만듭니다.
+        rebuild_index()
+        return None
+
+    def flush_live():
+        # 바뀐 줄만 다시 변환하여 출력창의 해당 부분만 고칩니다.
+        state['flush_scheduled'] = False
+        if state['index'] is None or state['dirty'] is None or state['busy']:
+            return
+        began = time.perf_counter()
+        patch = update_index(state['operation'])
+        if patch is None:
+            result = state['index'].render(state['operation'])
+            show_result(result, time.perf_counter() - began, " (실시간)")
+            return
+        converted = time.perf_counter()
+        start, old_len, new_text = patch
+        if old_len or new_text:
+            output_view.replace(start, old_len, new_text)
+            output_view.update_idletasks()
+        update_status(converted - began, time.perf_counter() - converted,
+                      len(output_view.buffer), " (실시간)")
+
+    def on_open():
+        path = filedialog.askopenfilename(
+            filetypes=[("Text 파일", "*.txt"), ("모든 파일", "*.*")],
+            title="변환할 파일 선택"
+        )
+        if not path:
+            return
+        try:
+            # 파일을 메모리 매핑해 읽고, 인코딩(UTF-8/CP949/EUC-KR)은 앞부분으로 감지
+            text, encoding = textfile.read_text(path)
+        except Exception as e:
+            messagebox.showerror("열기 실패", f"파일을 여는 중 오류가 발생했습니다:\n{e}")
+            return
+        input_box.delete("1.0", tk.END)
+        input_box.insert("1.0", text)
+        # 저장할 때도 같은 인코딩을 기본으로 사용
+        save_encoding.set(encoding)
+
+    def on_save():
+        path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text 파일", "*.txt"), ("모든 파일", "*.*")],
+            title="결과를 저장할 파일 선택"
+        )
+        if not path:
+            return
+        try:
+            # 위젯이 아닌 결과 버퍼에서 조각 단위로 바로 씁니다.
+            with open(path, "w", encoding=save_encoding.get(),
+                      buffering=textfile.WRITE_BUFFER) as f:
+                for chunk in output_view.buffer.chunks():
+                    f.write(chunk)
+                # 예전처럼 Text 위젯 내용(끝에 줄바꿈 포함)을 저장한 것과 같게 맞춤
+                f.write("\n")
+            messagebox.showinfo("저장 완료", f"'{path}'에 저장되었습니다.")
+        except Exception as e:
+            messagebox.showerror("저장 실패", f"파일 저장 중 오류가 발생했습니다:\n{e}")
+
+    def on_toggle_status():
+        if show_status.get():
+            status_bar.pack(side=tk.BOTTOM, fill=tk.X, before=input_label)
+        else:
+            status_bar.pack_forget()
+
+    def on_copy_result():
+        output_view.copy_all()
+
+    # GUI setup
+    root = tk.Tk()
+    # 기본 창 크기 및 최소 크기 설정
+    root.geometry("800x600")
+    root.minsize(800, 600)
+    text_font = tkfont.nametofont('TkTextFont').copy()
+    text_font.configure(size=12)
+    root.title("문단 변환기")
+
+    # 메뉴바에 File / Edit 기능 추가
+    menubar = tk.Menu(root)
+    filemenu = tk.Menu(menubar, tearoff=0)
+    filemenu.add_command(label="열기...", command=on_open)
+    filemenu.add_command(label="결과 저장...", command=on_save)
+    encodingmenu = tk.Menu(filemenu, tearoff=0)
+    save_encoding = tk.StringVar(value='utf-8')
+    for encoding in ('utf-8', 'utf-8-sig', 'cp949', 'euc-kr'):
+        encodingmenu.add_radiobutton(label=encoding, value=encoding, variable=save_encoding)
+    filemenu.add_cascade(label="저장 인코딩", menu=encodingmenu)
+    menubar.add_cascade(label="File", menu=filemenu)
+    editmenu = tk.Menu(menubar, tearoff=0)
+    editmenu.add_command(label="잘라내기", command=lambda: root.focus_get().event_generate('<<Cut>>'))
+    editmenu.add_command(label="복사", command=lambda: root.focus_get().event_generate('<<Copy>>'))
+    editmenu.add_command(label="붙여넣기", command=lambda: root.focus_get().event_generate('<<Paste>>'))
+    editmenu.add_separator()
+    editmenu.add_command(label="전체선택", command=lambda: root.focus_get().event_generate('<<SelectAll>>'))
+    menubar.add_cascade(label="Edit", menu=editmenu)
+    viewmenu = tk.Menu(menubar, tearoff=0)
+    show_status = tk.BooleanVar(value=False)
+    viewmenu.add_checkbutton(label="상태 표시줄", variable=show_status, command=on_toggle_status)
+    menubar.add_cascade(label="View", menu=viewmenu)
+    root.config(menu=menubar)
+
+    # 상태 표시줄 (View 메뉴에서 켜고 끔)
+    status_var = tk.StringVar(value="")
+    status_bar = tk.Label(root, textvariable=status_var, anchor='w', relief=tk.SUNKEN, bd=1)
+
+     # 입력 영역
+    input_label = tk.Label(root, text="입력 텍스트:")
+    input_label.pack(anchor='w', padx=10, pady=(10, 0))
+    input_box = scrolledtext.ScrolledText(root, wrap=tk.WORD, height=6, font = text_font)
+    input_box.pack(fill=tk.BOTH, expand=False, padx=10, pady=(0, 10))
+    input_box.bind('<KeyPress>', handle_shortcut)
+    input_box.bind('<<Modified>>', on_input_modified)
+
+    # 입력창 위젯 명령을 감싸 수정 범위를 추적 (실시간 미리보기용)
+    input_orig = input_box._w + "_orig"
+    root.tk.call('rename', input_box._w, input_orig)
+    root.tk.createcommand(input_box._w, input_proxy)
+
+    # SelectAll 이벤트 처리
+    input_box.bind('<<SelectAll>>', lambda e: (e.widget.tag_add('sel', '1.0', 'end-1c'), 'break')[1])
+
+    # 우클릭 컨텍스트 메뉴 설정
+    ctx_menu = tk.Menu(root, tearoff=0)
+    ctx_menu.add_command(label="잘라내기",   command=lambda: input_box.event_generate('<<Cut>>'))
+    ctx_menu.add_command(label="복사",       command=lambda: input_box.event_generate('<<Copy>>'))
+    ctx_menu.add_command(label="붙여넣기",   command=lambda: input_box.event_generate('<<Paste>>'))
+    ctx_menu.add_separator()
+    ctx_menu.add_command(label="전체선택",   command=lambda: input_box.event_generate('<<SelectAll>>'))
+    for btn in ("<Button-2>", "<Button-3>"):
+        input_box.bind(btn, lambda e, m=ctx_menu: m.tk_popup(e.x_root, e.y_root))
+
+    # 버튼들
+    button_frame = tk.Frame(root)
+    button_frame.pack(pady=5)
+    merge_button = tk.Button(button_frame, text="합치기 (줄 → 문단)", command=on_merge)
+    merge_button.pack(side=tk.LEFT, padx=5)
+    split_button = tk.Button(button_frame, text="공백추가 (줄 공백추가)", command=on_split)
+    split_button.pack(side=tk.LEFT, padx=5)
+    cancel_button = tk.Button(button_frame, text="취소", command=on_cancel, state=tk.DISABLED)
+    cancel_button.pack(side=tk.LEFT, padx=5)
+    live_var = tk.BooleanVar(value=False)
+    live_check = tk.Checkbutton(button_frame, text="실시간 미리보기", variable=live_var,
+                                command=on_toggle_live)
+    live_check.pack(side=tk.LEFT, padx=5)
+    tk.Button(button_frame, text="결과 텍스트 복사하기", command=on_copy_result).pack(side=tk.RIGHT, padx=5)
+
+    # 진행률 표시
+    progress = ttk.Progressbar(root, mode='determinate', maximum=100)
+    progress.pack(fill=tk.X, padx=10)
+
+    # 출력 영역
+    tk.Label(root, text="결과 텍스트:").pack(anchor='w', padx=10, pady=(10, 0))
+
+    output_view = ResultViewer(root, font = text_font)
+    output_view.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+    output_view.text.bind('<KeyPress>', handle_shortcut)
+
+    root.mainloop()
+
+
+def open_text(path: str, mode: str, encoding: str):
+    # '-' 는 표준 입출력. 줄바꿈 변환 없이(newline='') 원본 그대로 읽고 씁니다.
+    if path == '-':
+        stream = sys.stdin.buffer if mode == 'r' else sys.stdout.buffer
+        return io.TextIOWrapper(stream, encoding=encoding, newline='')
+    return open(path, mode, encoding=encoding, newline='')
+
+
+def convert_stream(operation: str, src, dst, chunk_size: int = CHUNK_SIZE):
+    # src 를 청크 단위로 읽어 변환하며 바로 dst 에 씁니다. 메모리 사용량은 청크 크기에 비례합니다.
+    for piece in STREAM_CONVERTERS[operation](read_chunks(src, chunk_size)):
+        dst.write(piece)
+
+
+def check_encodings(args):
+    # --encoding / --output-encoding 이름을 미리 확인합니다. 모르는 이름이면 ValueError
+    for encoding in (args.encoding, args.output_encoding):
+        if encoding is None or encoding == 'auto':
+            continue
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            raise ValueError(f"알 수 없는 인코딩: {encoding}") from None
+
+
+def check_paths(args):
+    # 입력과 출력이 같은 파일이면 ValueError. 출력을 쓰기 시작하면 아직 읽지 않은 입력이 지워집니다.
+    if '-' in (args.input, args.output):
         return
-    result = merge_sentences_to_paragraph(input_text)
-    output_box.delete("1.0", tk.END)
-    output_box.insert(tk.END, result)
-
-def on_split():
-    txt = input_box.get("1.0", tk.END)
-    if not txt.strip():
-        messagebox.showwarning("입력 오류", "변환할 텍스트를 입력하세요.")
+    try:
+        same = os.path.samefile(args.input, args.output)
+    except OSError:
         return
-    output_box.delete("1.0", tk.END)
-    output_box.insert(tk.END, split_paragraph_to_sentences(txt))
-
-def on_save():
-    path = filedialog.asksaveasfilename(
-        defaultextension=".txt",
-        filetypes=[("Text 파일", "*.txt"), ("모든 파일", "*.*")],
-        title="결과를 저장할 파일 선택"
+    if same:
+        raise ValueError(f"입력과 출력이 같은 파일입니다: {args.output}")
+
+
+def cmd_convert(args):
+    if args.chunk_size <= 0:
+        print("--chunk-size 는 1 이상이어야 합니다.", file=sys.stderr)
+        return 2
+    try:
+        check_encodings(args)
+        check_paths(args)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    encoding = None if args.encoding == 'auto' else args.encoding
+    try:
+        if args.input != '-' and args.output != '-':
+            # 파일 -> 파일: 메모리 매핑하여 가능하면 디코딩 없이 변환
+            textfile.convert_file(args.input, args.output, args.command,
+                                  encoding, args.output_encoding)
+            return 0
+        if encoding is None:
+            encoding = 'utf-8' if args.input == '-' else textfile.sniff_encoding(args.input)
+        with open_text(args.input, 'r', encoding) as src, \
+             open_text(args.output, 'w', args.output_encoding or encoding) as dst:
+            convert_stream(args.command, src, dst, args.chunk_size)
+    except (OSError, UnicodeError) as e:
+        print(f"변환 실패: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_pipe(args):
+    if args.chunk_size <= 0:
+        print("--chunk-size 는 1 이상이어야 합니다.", file=sys.stderr)
+        return 2
+    try:
+        check_encodings(args)
+        check_paths(args)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    try:
+        pipe = pipeline.compile_pipeline(args.steps)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    encoding = None if args.encoding == 'auto' else args.encoding
+    try:
+        if encoding is None:
+            encoding = 'utf-8' if args.input == '-' else textfile.sniff_encoding(args.input)
+        with open_text(args.input, 'r', encoding) as src, \
+             open_text(args.output, 'w', args.output_encoding or encoding) as dst:
+            for piece in pipe.iter(read_chunks(src, args.chunk_size)):
+                dst.write(piece)
+    except (OSError, UnicodeError) as e:
+        print(f"변환 실패: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_batch(args):
+    if args.part_size <= 0 or (args.jobs is not None and args.jobs <= 0):
+        print("--part-size 와 --jobs 는 1 이상이어야 합니다.", file=sys.stderr)
+        return 2
+    try:
+        check_encodings(args)
+        batch.check_name_template(args.name)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    records = batch.run_batch(
+        args.paths, args.operation,
+        output_dir=args.output_dir,
+        name_template=args.name,
+        if_exists=args.if_exists,
+        jobs=args.jobs,
+        part_size=args.part_size << 20,
+        encoding=None if args.encoding == 'auto' else args.encoding,
+        output_encoding=args.output_encoding,
+        pattern=args.pattern,
+        report=batch.print_record,
     )
-    if not path:
-        return
-    content = output_box.get("1.0", tk.END)
+    if args.summary:
+        batch.write_summary(records, args.summary)
+    counts = {status: sum(r['status'] == status for r in records)
+              for status in ('ok', 'skipped', 'failed')}
+    print(f"완료 {counts['ok']}, 건너뜀 {counts['skipped']}, 실패 {counts['failed']}")
+    return 1 if counts['failed'] else 0
+
+
+def cmd_watch(args):
+    if args.interval <= 0:
+        print("--interval 은 0 보다 커야 합니다.", file=sys.stderr)
+        return 2
+    try:
+        check_encodings(args)
+        batch.check_name_template(args.name)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
-        messagebox.showinfo("저장 완료", f"'{path}'에 저장되었습니다.")
-    except Exception as e:
-        messagebox.showerror("저장 실패", f"파일 저장 중 오류가 발생했습니다:\n{e}")
-
-def on_copy_result():
-    # 결과 텍스트를 클립보드에 복사
-    content = output_box.get("1.0", tk.END)
-    root.clipboard_clear()
-    root.clipboard_append(content)
-
-# GUI setup
-root = tk.Tk()
-# 기본 창 크기 및 최소 크기 설정
-root.geometry("800x600")
-root.minsize(800, 600)
-text_font = tkfont.nametofont('TkTextFont').copy()
-text_font.configure(size=12)
-root.title("문단 변환기")
-
-# 메뉴바에 Edit 기능 추가
-menubar = tk.Menu(root)
-editmenu = tk.Menu(menubar, tearoff=0)
-editmenu.add_command(label="잘라내기", command=lambda: root.focus_get().event_generate('<<Cut>>'))
-editmenu.add_command(label="복사", command=lambda: root.focus_get().event_generate('<<Copy>>'))
-editmenu.add_command(label="붙여넣기", command=lambda: root.focus_get().event_generate('<<Paste>>'))
-editmenu.add_separator()
-editmenu.add_command(label="전체선택", command=lambda: root.focus_get().event_generate('<<SelectAll>>'))
-menubar.add_cascade(label="Edit", menu=editmenu)
-root.config(menu=menubar)
-
- # 입력 영역
-tk.Label(root, text="입력 텍스트:").pack(anchor='w', padx=10, pady=(10, 0))
-input_box = scrolledtext.ScrolledText(root, wrap=tk.WORD, height=6, font = text_font)
-input_box.pack(fill=tk.BOTH, expand=False, padx=10, pady=(0, 10))
-input_box.bind('<KeyPress>', handle_shortcut)
-
-# SelectAll 이벤트 처리
-input_box.bind('<<SelectAll>>', lambda e: (e.widget.tag_add('sel', '1.0', 'end-1c'), 'break')[1])
-
-# 우클릭 컨텍스트 메뉴 설정
-ctx_menu = tk.Menu(root, tearoff=0)
-ctx_menu.add_command(label="잘라내기",   command=lambda: input_box.event_generate('<<Cut>>'))
-ctx_menu.add_command(label="복사",       command=lambda: input_box.event_generate('<<Copy>>'))
-ctx_menu.add_command(label="붙여넣기",   command=lambda: input_box.event_generate('<<Paste>>'))
-ctx_menu.add_separator()
-ctx_menu.add_command(label="전체선택",   command=lambda: input_box.event_generate('<<SelectAll>>'))
-for btn in ("<Button-2>", "<Button-3>"):
-    input_box.bind(btn, lambda e, m=ctx_menu: m.tk_popup(e.x_root, e.y_root))
-
-# 버튼들
-button_frame = tk.Frame(root)
-button_frame.pack(pady=5)
-tk.Button(button_frame, text="합치기 (줄 → 문단)", command=on_merge).pack(side=tk.LEFT, padx=5)
-tk.Button(button_frame, text="공백추가 (줄 공백추가)", command=on_split).pack(side=tk.LEFT, padx=5)
-tk.Button(button_frame, text="결과 텍스트 복사하기", command=on_copy_result).pack(side=tk.RIGHT, padx=5)
-
-# 출력 영역
-tk.Label(root, text="결과 텍스트:").pack(anchor='w', padx=10, pady=(10, 0))
-
-output_box = scrolledtext.ScrolledText(root, wrap=tk.WORD, font = text_font)
-output_box.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
-output_box.bind('<KeyPress>', handle_shortcut)
-
-root.mainloop()
\ No newline at end of file
+        watcher = watch.Watcher(
+            args.paths, args.operation,
+            output_dir=args.output_dir,
+            name_template=args.name,
+            pattern=args.pattern,
+            encoding=None if args.encoding == 'auto' else args.encoding,
+            output_encoding=args.output_encoding,
+            state_path=args.state,
+        )
+        watcher.run(args.interval, args.once, report=watch.print_record)
+    except KeyboardInterrupt:
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"감시 실패: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_serve(args):
+    if args.inline_limit < 0 or (args.jobs is not None and args.jobs <= 0):
+        print("--inline-limit 은 0 이상, --jobs 는 1 이상이어야 합니다.", file=sys.stderr)
+        return 2
+    # 소켓을 지정하지 않으면 표준 입출력으로 받습니다.
+    stdio = args.stdio or not (args.unix or args.tcp)
+    try:
+        stats = asyncio.run(server.serve(stdio, args.unix, args.tcp, args.jobs, args.inline_limit))
+    except KeyboardInterrupt:
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"서버 실행 실패: {e}", file=sys.stderr)
+        return 1
+    print(f"요청 {stats['requests']}건, 오류 {stats['errors']}건, "
+          f"지연 p50 {stats['latency_ms']['p50']}ms / p99 {stats['latency_ms']['p99']}ms",
+          file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="문단 변환기. 인자 없이 실행하면 GUI 를 띄웁니다.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (('merge', "여러 줄 -> 한 문단"),
+                            ('split', "줄 사이에 빈 줄 추가")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("input", help="입력 파일 ('-' 는 표준 입력)")
+        p.add_argument("output", help="출력 파일 ('-' 는 표준 출력)")
+        p.add_argument("--encoding", default="auto",
+                       help="입력 인코딩 (기본값: auto - 파일 앞부분으로 감지, 표준 입력은 utf-8)")
+        p.add_argument("--output-encoding", help="출력 인코딩 (기본값: 입력과 같음)")
+        p.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                       help="표준 입출력을 사용할 때 한 번에 읽을 글자 수")
+        p.set_defaults(handler=cmd_convert)
+
+    p = sub.add_parser('pipe', help="여러 단계를 이어 한 번에 변환",
+                       description="단계: " + ", ".join(f"{k}({v})" for k, v in pipeline.STEPS.items()))
+    p.add_argument("steps", help="쉼표로 구분한 단계 목록 (예: trim,collapse,sentences)")
+    p.add_argument("input", help="입력 파일 ('-' 는 표준 입력)")
+    p.add_argument("output", help="출력 파일 ('-' 는 표준 출력)")
+    p.add_argument("--encoding", default="auto",
+                   help="입력 인코딩 (기본값: auto - 파일 앞부분으로 감지, 표준 입력은 utf-8)")
+    p.add_argument("--output-encoding", help="출력 인코딩 (기본값: 입력과 같음)")
+    p.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="한 번에 읽을 글자 수")
+    p.set_defaults(handler=cmd_pipe)
+
+    p = sub.add_parser('batch', help="여러 파일/폴더를 병렬로 일괄 변환")
+    p.add_argument("operation", choices=sorted(STREAM_CONVERTERS), help="변환 종류")
+    p.add_argument("paths", nargs='+', help="입력 파일, 글롭 패턴 또는 폴더")
+    p.add_argument("-o", "--output-dir", help="출력 폴더 (기본값: 입력 파일과 같은 폴더)")
+    p.add_argument("--name", default=batch.DEFAULT_NAME_TEMPLATE,
+                   help="출력 파일 이름 형식 ({stem}, {ext}, {name}, {op} 사용 가능, "
+                        "기본값: %(default)s)")
+    p.add_argument("--if-exists", choices=batch.OVERWRITE_POLICIES, default='skip',
+                   help="출력 파일이 이미 있을 때 처리 방법 (기본값: %(default)s)")
+    p.add_argument("-j", "--jobs", type=int, help="작업 프로세스 수 (기본값: CPU 코어 수)")
+    p.add_argument("--part-size", type=int, default=batch.DEFAULT_PART_SIZE >> 20,
+                   help="이보다 큰 파일은 나누어 병렬 변환 (MB, 기본값: %(default)s)")
+    p.add_argument("--pattern", default=batch.DEFAULT_PATTERN,
+                   help="폴더에서 찾을 파일 패턴 (기본값: %(default)s)")
+    p.add_argument("--encoding", default="auto",
+                   help="입력 인코딩 (기본값: auto - 파일마다 감지)")
+    p.add_argument("--output-encoding", help="출력 인코딩 (기본값: 입력과 같음)")
+    p.add_argument("--summary", help="파일별 요약을 저장할 CSV 파일")
+    p.set_defaults(handler=cmd_batch)
+
+    p = sub.add_parser('watch', help="폴더를 감시하며 새로 생기거나 덧붙은 줄만 변환")
+    p.add_argument("operation", choices=sorted(STREAM_CONVERTERS), help="변환 종류")
+    p.add_argument("paths", nargs='+', help="감시할 파일, 글롭 패턴 또는 폴더")
+    p.add_argument("-o", "--output-dir", help="출력 폴더 (기본값: 입력 파일과 같은 폴더)")
+    p.add_argument("--name", default=batch.DEFAULT_NAME_TEMPLATE,
+                   help="출력 파일 이름 형식 (기본값: %(default)s)")
+    p.add_argument("--pattern", default=batch.DEFAULT_PATTERN,
+                   help="폴더에서 찾을 파일 패턴 (기본값: %(default)s)")
+    p.add_argument("--encoding", default="auto",
+                   help="입력 인코딩 (기본값: auto - 파일마다 처음 볼 때 감지)")
+    p.add_argument("--output-encoding", help="출력 인코딩 (기본값: 입력과 같음)")
+    p.add_argument("--state", default=watch.DEFAULT_STATE,
+                   help="체크포인트 파일 (기본값: %(default)s)")
+    p.add_argument("--interval", type=float, default=watch.DEFAULT_INTERVAL,
+                   help="확인 주기 (초, 기본값: %(default)s)")
+    p.add_argument("--once", action="store_true", help="한 번만 확인하고 종료")
+    p.set_defaults(handler=cmd_watch)
+
+    p = sub.add_parser('serve', help="변환 서버로 상주 실행 (JSON 한 줄 단위 요청)")
+    p.add_argument("--stdio", action="store_true",
+                   help="표준 입출력으로도 요청을 받음 (소켓을 지정하지 않으면 기본)")
+    p.add_argument("--unix", metavar="PATH", help="유닉스 소켓 경로")
+    p.add_argument("--tcp", metavar="[HOST:]PORT", help="TCP 주소 (기본 호스트: 127.0.0.1)")
+    p.add_argument("-j", "--jobs", type=int, help="작업 프로세스 수 (기본값: CPU 코어 수)")
+    p.add_argument("--inline-limit", type=int, default=server.INLINE_LIMIT,
+                   help="이 글자 수 이하의 요청은 작업 프로세스로 보내지 않고 바로 변환 "
+                        "(기본값: %(default)s)")
+    p.set_defaults(handler=cmd_serve)
+    return parser
+
+
+def run_cli(argv):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        run_gui()
+        return 0
+    return run_cli(argv)
+
+
+if __name__ == "__main__":
+    # PyInstaller 로 묶은 실행 파일에서 작업 프로세스를 띄우기 위해 필요
+    multiprocessing.freeze_support()
+    sys.exit(main())
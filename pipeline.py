@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+여러 변환 단계를 이어 한 번에 처리하는 파이프라인.
+
+    pipe = compile_pipeline("trim,collapse,sentences")
+    pipe.run(text)                      # 문자열 -> 문자열
+    for piece in pipe.iter(chunks): ... # 청크 단위 스트리밍
+
+단계는 모두 줄 단위 생성기로 이어지므로 입력을 한 번만 훑고, 단계마다 전체 복사본을 만들지 않습니다.
+이어진 줄 단위 단계(trim, normalize)는 함수 하나로 합치고, 뒤 단계가 이미 하는 일은 지웁니다.
+(예: merge 앞의 trim/normalize/collapse/split, sentences 앞의 trim/normalize/collapse)
+결과가 기존 합치기/공백추가와 같아지면 converter.py 의 스트리밍 변환기를 그대로 씁니다.
+"""
+import re
+from functools import lru_cache
+from itertools import islice
+
+from converter import STREAM_CONVERTERS, _LINE_BREAKS
+
+# 단계 이름과 설명
+STEPS = {
+    'trim': "줄 앞뒤 공백 제거",
+    'normalize': "연속 공백을 공백 하나로",
+    'collapse': "연속 빈 줄을 빈 줄 하나로",
+    'merge': "여러 줄 -> 한 문단",
+    'split': "줄 사이에 빈 줄 추가",
+    'sentences': "문장마다 줄바꿈 (문단 사이는 빈 줄)",
+}
+# 출력 조각 하나에 모으는 줄 수
+OUTPUT_LINES = 1024
+# 끝나지 않은 문장을 다음 묶음과 이어 다시 검사할 때 보는 뒷부분의 길이 (글자 수)
+RESCAN_TAIL = 256
+
+# --- 문장 나누기 ---
+
+# 마침표 뒤에 와도 문장이 끝나지 않는 약어 (소문자, 마지막 '.' 제외)
+ABBREVIATIONS = frozenset((
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'mt', 'vs', 'etc', 'no', 'vol',
+    'fig', 'inc', 'ltd', 'co', 'corp', 'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug',
+    'sep', 'sept', 'oct', 'nov', 'dec', 'approx', 'dept', 'est', 'p', 'pp', 'cf', 'al',
+))
+# 문장 끝 문장부호 뒤에 붙는 닫는 따옴표/괄호
+_CLOSERS = "\"'”’)]}」』》〉"
+# 단어 앞에 붙는 여는 따옴표/괄호
+_OPENERS = "\"'“‘([{「『《〈"
+# 인용문 뒤에 이어지는 말 ("...." 라고 했다) - 이 경우 인용문 끝은 문장 끝이 아닙니다.
+_QUOTATIVE = r" (?:이?라(?:고|며|는)|하고|하며|하는|고 )"
+_PUNCT = "[.?!…。？！]"
+_CLOSE = "[" + re.escape(_CLOSERS) + "]"
+# 문장부호(와 닫는 따옴표) 다음이 공백이나 끝이어야 문장 끝입니다.
+# 닫는 따옴표로 끝나는 경우 인용문 뒤의 말이 오면 제외하고, 맨 끝이면 다음 줄을 보고 판단합니다.
+_END = rf"(?:{_CLOSE}+(?=\s)(?!{_QUOTATIVE})|(?=\s|$))"
+# 항상 문장 끝인 곳. 한 번의 치환으로 '\n' 을 넣습니다. (뒤의 공백 하나는 지움)
+#   - ASCII 가 아닌 글자(한글 등) 뒤의 문장부호: '다.', '요?'
+#   - 마침표 하나가 아닌 문장부호: '?', '!', '...', '?!'
+#   - 띄어쓰기 없이 이어 쓴 한국어 문장: '다.그리고' 처럼 종결 어미 + 문장부호 바로 뒤에 한글
+_SURE_END = re.compile(
+    # 정규식이 문장부호가 있는 곳에서만 검사하도록 문장부호로 시작하고 앞 글자는 뒤에서 확인합니다.
+    rf"({_PUNCT}(?<!{_PUNCT}{_PUNCT})(?:"
+    rf"(?:(?<![\x00-\x7f]{_PUNCT})|(?<!\.)){_PUNCT}*{_END}"
+    rf"|{_PUNCT}+{_END}"
+    r"|(?<=[다요죠까네지자라][.?!])[.?!]*(?=[가-힣])"
+    r")) ?"
+)
+# 약어/이니셜/번호일 수 있는 곳: ASCII 글자 뒤의 마침표 하나. 토큰을 보고 판단합니다.
+_MAYBE_END = re.compile(rf"\.(?<=[\x00-\x7f]\.)(?<!{_PUNCT}\.)(?!{_PUNCT}){_END}")
+# U.S, e.g, p.m 처럼 한 글자와 '.' 이 번갈아 나오는 약어 (마지막 '.' 제외)
+_DOTTED = re.compile(r"(?:[^\W\d_]\.)+[^\W\d_]")
+_SPACES = re.compile(r"\s+")
+
+
+def _not_end(text: str, i: int, start: int) -> bool:
+    # text[i] 의 마침표가 약어/이니셜/번호의 일부인지. start 는 현재 문장의 시작 위치입니다.
+    space = text.rfind(' ', start, i)
+    token = text[max(space + 1, start):i].lstrip(_OPENERS)
+    if not token:
+        return False
+    if token.lower() in ABBREVIATIONS or _DOTTED.fullmatch(token):
+        return True
+    # 이니셜 (J. Smith)
+    if len(token) == 1 and token.isascii() and token.isupper():
+        return True
+    # 문장 맨 앞의 번호 (1. 항목)
+    return token.isdigit() and space < 0
+
+
+def _scan(text: str):
+    """
+    공백 하나로 이어진 text 를 문장으로 나눕니다. (끝난 문장 목록, 끝나지 않은 나머지) 를 돌려줍니다.
+    확실한 문장 끝은 정규식 한 번으로 나누고, 마침표 하나만 있는 곳은 토큰을 보고 판단합니다.
+    """
+    if not _MAYBE_END.search(text):
+        # 판단할 곳이 없으면 split 한 번으로 끝냅니다. (문장, 문장부호, 문장, 문장부호, ..., 나머지)
+        parts = _SURE_END.split(text)
+        return list(map(str.__add__, parts[0:-1:2], parts[1::2])), parts[-1]
+    text = _SURE_END.sub('\\1\n', text)
+    pieces = []
+    last = start = 0
+    for match in _MAYBE_END.finditer(text):
+        i = match.start()
+        start = max(start, text.rfind('\n', 0, i) + 1)
+        if _not_end(text, i, start):
+            continue
+        end = match.end()
+        pieces.append(text[last:end])
+        pieces.append('\n')
+        last = start = end + 1 if text[end:end + 1] == ' ' else end
+    if pieces:
+        pieces.append(text[last:])
+        text = ''.join(pieces)
+    sentences = text.split('\n')
+    return sentences, sentences.pop()
+
+
+def iter_sentences(lines):
+    """
+    줄들을 문장 단위로 다시 나눕니다. 빈 줄이 아닌 줄은 문단 안에서 공백 하나로 이어 붙인 뒤
+    문장마다 한 줄로 내보내고, 문단 사이에는 빈 줄을 하나 넣습니다.
+    문단이 끝나면 문장부호가 없어도 문장이 끝난 것으로 봅니다.
+    줄마다 검사하지 않고 OUTPUT_LINES 줄씩 이어 붙여 한 번에 찾습니다.
+    """
+    held = []        # 끝나지 않은 문장 중 다시 검사하지 않는 앞부분
+    pending = ''     # 끝나지 않은 문장의 뒷부분 (다음 묶음과 이어 다시 검사)
+    gap = False      # 앞 문단이 끝나 다음 문장 앞에 빈 줄이 필요한지
+    started = False
+    batch = []
+
+    def flush():
+        nonlocal pending
+        # 줄마다가 아니라 묶음 전체의 공백을 한 번에 정리합니다.
+        text = ' '.join(' '.join(batch).split())
+        batch.clear()
+        if pending:
+            text = pending + ' ' + text
+        sentences, pending = _scan(text)
+        if held and sentences:
+            sentences[0] = ''.join(held) + sentences[0]
+            held.clear()
+        size = len(pending)
+        if size > 2 * RESCAN_TAIL:
+            # 문장부호 없이 긴 문단에서 끝나지 않은 문장 전체를 매번 다시 검사하지 않도록
+            # 뒷부분만 남깁니다. 앞부분은 뒤에 글자가 충분히 있어 이미 판단이 끝난 곳입니다.
+            # 토큰 검사(_not_end)가 바뀌지 않게 공백에서 자릅니다. 묶음을 이을 때 공백을 넣으므로
+            # 이번 묶음보다 앞까지 찾아 들어가지 않습니다.
+            cut = pending.rfind(' ', 0, size - RESCAN_TAIL)
+            if cut > 0:
+                held.append(pending[:cut])
+                pending = pending[cut:]
+        return sentences
+
+    def unfinished():
+        nonlocal pending
+        sentence = ''.join(held) + pending
+        held.clear()
+        pending = ''
+        return sentence
+
+    for line in lines:
+        if not line or line.isspace():
+            if batch:
+                yield from flush()
+            if pending:
+                yield unfinished()
+            gap = started
+            continue
+        if gap:
+            yield ''
+            gap = False
+        started = True
+        batch.append(line)
+        if len(batch) >= OUTPUT_LINES:
+            yield from flush()
+    if batch:
+        yield from flush()
+    if pending:
+        yield unfinished()
+
+
+def segment_sentences(text: str):
+    # 문자열 -> 문장 목록 (문단 구분 없이)
+    return [s for s in iter_sentences(text.splitlines()) if s]
+
+
+# --- 줄 단위 단계 ---
+
+def _trim(line: str) -> str:
+    return line.strip()
+
+
+def _normalize(line: str) -> str:
+    return _SPACES.sub(' ', line)
+
+
+def _trim_normalize(line: str) -> str:
+    return ' '.join(line.split())
+
+
+_LINE_STEPS = {'trim': _trim, 'normalize': _normalize}
+
+
+def _line_function(names):
+    # 이어진 줄 단위 단계들을 함수 하나로 만듭니다.
+    # 같은 단계를 여러 번 하는 것은 한 번과 같고, trim 과 normalize 는 순서와 관계없이 한 번에 처리됩니다.
+    names = set(names)
+    if len(names) > 1:
+        return _trim_normalize
+    return _LINE_STEPS[names.pop()]
+
+
+# --- 구조 단계 (줄 목록 -> 줄 목록) ---
+
+def iter_collapse(lines):
+    blank = False
+    for line in lines:
+        if line.strip():
+            blank = False
+            yield line
+        elif not blank:
+            blank = True
+            yield ''
+
+
+def iter_split(lines):
+    # split_paragraph_to_sentences 와 같음: 빈 줄을 빼고 줄 사이에 빈 줄 하나
+    first = True
+    for line in lines:
+        if line.strip():
+            if not first:
+                yield ''
+            first = False
+            yield line
+
+
+def iter_lines(chunks):
+    """
+    str 청크들을 str.splitlines() 와 같은 규칙으로 줄 단위로 나눕니다.
+    청크 경계에 걸친 줄과 '\\r\\n' 사이에서 잘린 '\\r' 을 이어 붙입니다.
+    """
+    parts = []        # 아직 끝나지 않은 줄의 조각들
+    carry = ''
+    for chunk in chunks:
+        data = carry + chunk
+        carry = ''
+        if data.endswith('\r'):
+            data, carry = data[:-1], '\r'
+        lines = data.splitlines()
+        if not lines:
+            continue
+        ends = data[-1] in _LINE_BREAKS
+        parts.append(lines[0])
+        if len(lines) == 1 and not ends:
+            continue
+        yield ''.join(parts)
+        parts = [] if ends else [lines.pop()]
+        yield from lines[1:]
+    if carry or parts:
+        yield ''.join(parts)
+
+
+def _join_lines(lines, size: int = OUTPUT_LINES):
+    # 줄들을 '\n' 으로 이어 size 줄씩 묶어 내보냅니다. (마지막 줄 뒤에는 줄바꿈 없음)
+    lines = iter(lines)
+    prefix = ''
+    while True:
+        batch = list(islice(lines, size))
+        if not batch:
+            return
+        yield prefix + '\n'.join(batch)
+        prefix = '\n'
+
+
+def parse_steps(spec):
+    # "trim,sentences" 또는 ['trim', 'sentences'] -> 단계 이름 튜플
+    names = spec.split(',') if isinstance(spec, str) else list(spec)
+    names = tuple(name.strip() for name in names if name.strip())
+    unknown = [name for name in names if name not in STEPS]
+    if unknown:
+        raise ValueError(f"알 수 없는 단계: {', '.join(unknown)} (가능: {', '.join(STEPS)})")
+    if not names:
+        raise ValueError("단계가 없습니다.")
+    return names
+
+
+def _optimize(names):
+    # 결과가 같은 범위에서 단계를 줄입니다.
+    out = []
+    for name in names:
+        last = out[-1] if out else None
+        if last == 'merge' and name != 'sentences':
+            # 합친 결과는 공백이 정리된 한 줄이므로 sentences 외에는 바뀌지 않습니다.
+            continue
+        if last == 'sentences' and name in ('trim', 'normalize', 'collapse'):
+            # 문장 나누기 결과는 이미 공백이 정리되어 있고 빈 줄도 하나씩입니다.
+            continue
+        if name == 'collapse' and last in ('collapse', 'split'):
+            continue
+        if name == 'merge':
+            # 단어를 나누거나 붙이지 않는 단계는 merge 결과를 바꾸지 않습니다.
+            # (sentences 는 '다.요?' 처럼 붙어 있는 문장을 나누므로 남깁니다.)
+            while out and out[-1] != 'sentences':
+                out.pop()
+        elif name == 'sentences':
+            # 공백 정리와 빈 줄 처리를 스스로 하므로 앞의 trim/normalize/collapse 는 필요 없음
+            while out and out[-1] in ('trim', 'normalize', 'collapse'):
+                out.pop()
+        elif name == 'split':
+            while out and out[-1] == 'collapse':
+                out.pop()
+        out.append(name)
+    return tuple(out)
+
+
+class Pipeline:
+    """
+    컴파일된 파이프라인. steps 는 실제로 실행하는 (줄인) 단계 목록입니다.
+    """
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.steps = _optimize(self.names)
+        # 기존 변환과 같으면 청크 단위 스트리밍 변환기를 그대로 씁니다. (줄 단위로 나누지 않음)
+        self._fast = STREAM_CONVERTERS.get(self.steps[0]) if len(self.steps) == 1 else None
+        self._stages = []
+        line_steps = []
+        for name in self.steps:
+            if name in _LINE_STEPS:
+                line_steps.append(name)
+                continue
+            if line_steps:
+                self._stages.append(self._map(_line_function(line_steps)))
+                line_steps = []
+            self._stages.append(self._structural(name))
+        if line_steps:
+            self._stages.append(self._map(_line_function(line_steps)))
+
+    @staticmethod
+    def _map(function):
+        return lambda lines: map(function, lines)
+
+    @staticmethod
+    def _structural(name):
+        if name == 'collapse':
+            return iter_collapse
+        if name == 'split':
+            return iter_split
+        if name == 'sentences':
+            return iter_sentences
+        # merge 뒤에는 sentences 만 남으므로(_optimize) 한 줄로 합치는 대신 빈 줄만 빼서
+        # 문단 구분 없이 문장을 나누게 합니다. 마지막 merge 는 iter() 에서 따로 처리합니다.
+        return lambda lines: filter(str.strip, lines)
+
+    def iter(self, chunks):
+        # str 청크들을 변환한 결과 조각들
+        if self._fast is not None:
+            yield from self._fast(chunks)
+            return
+        stages = self._stages
+        if self.steps[-1] == 'merge':
+            # 마지막 merge 는 결과 한 줄을 통째로 만들지 않고 기존 스트리밍 변환기로 내보냅니다.
+            lines = iter_lines(chunks)
+            for stage in stages[:-1]:
+                lines = stage(lines)
+            yield from STREAM_CONVERTERS['merge'](line + '\n' for line in lines)
+            return
+        lines = iter_lines(chunks)
+        for stage in stages:
+            lines = stage(lines)
+        yield from _join_lines(lines)
+
+    def run(self, text: str) -> str:
+        return ''.join(self.iter((text,)))
+
+
+@lru_cache(maxsize=64)
+def _compile(names):
+    return Pipeline(names)
+
+
+def compile_pipeline(spec) -> Pipeline:
+    # 단계 문자열/목록 -> Pipeline (같은 단계 목록은 한 번만 컴파일)
+    return _compile(parse_steps(spec))
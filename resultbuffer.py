@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+변환 결과 보관용 버퍼. tkinter 에 의존하지 않습니다.
+"""
+import bisect
+from itertools import accumulate
+
+# 조각 하나의 최대 글자 수. 일부를 고칠 때 이 크기 정도만 다시 만듭니다.
+MAX_CHUNK = 1 << 16
+
+
+def _split(text: str):
+    return [text[i:i + MAX_CHUNK] for i in range(0, len(text), MAX_CHUNK)]
+
+
+class ResultBuffer:
+    """
+    변환 결과를 문자열 조각 목록으로 보관합니다. 전체를 하나로 이어 붙이지 않으므로
+    큰 결과도 추가 복사 없이 보관하고, 필요한 구간만 잘라 읽을 수 있습니다.
+    """
+    def __init__(self, chunks=()):
+        self._chunks = []
+        for chunk in chunks:
+            if len(chunk) > MAX_CHUNK:
+                self._chunks.extend(_split(chunk))
+            elif chunk:
+                self._chunks.append(chunk)
+        self._reindex()
+
+    def _reindex(self):
+        # 조각별 시작 위치
+        self._starts = list(accumulate((len(c) for c in self._chunks), initial=0))
+        self._length = self._starts.pop()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def chunks(self):
+        return iter(self._chunks)
+
+    def _locate(self, pos: int) -> int:
+        # pos 가 들어 있는 조각 번호 (pos == 길이면 마지막 조각)
+        return max(bisect.bisect_right(self._starts, pos) - 1, 0)
+
+    def slice(self, start: int, end: int) -> str:
+        start, end = max(start, 0), min(end, self._length)
+        if start >= end:
+            return ''
+        i = self._locate(start)
+        out = []
+        while i < len(self._chunks) and self._starts[i] < end:
+            base = self._starts[i]
+            out.append(self._chunks[i][max(start - base, 0):end - base])
+            i += 1
+        return ''.join(out)
+
+    def line_start(self, pos: int) -> int:
+        # pos 가 속한 줄의 시작 위치 (pos 앞의 마지막 '\n' 다음)
+        pos = min(max(pos, 0), self._length)
+        if not self._chunks:
+            return 0
+        i = self._locate(pos)
+        limit = pos - self._starts[i]
+        while i >= 0:
+            k = self._chunks[i].rfind('\n', 0, limit)
+            if k >= 0:
+                return self._starts[i] + k + 1
+            i -= 1
+            limit = len(self._chunks[i]) if i >= 0 else 0
+        return 0
+
+    def line_end(self, pos: int) -> int:
+        # pos 가 속한 줄의 끝 위치 ('\n' 의 위치, 없으면 전체 길이)
+        pos = min(max(pos, 0), self._length)
+        if not self._chunks:
+            return 0
+        i = self._locate(pos)
+        offset = pos - self._starts[i]
+        while i < len(self._chunks):
+            k = self._chunks[i].find('\n', offset)
+            if k >= 0:
+                return self._starts[i] + k
+            i += 1
+            offset = 0
+        return self._length
+
+    def replace(self, start: int, end: int, text: str):
+        # start..end-1 글자를 text 로 바꿉니다. 바뀐 부분의 조각만 다시 만듭니다.
+        start, end = max(start, 0), min(end, self._length)
+        if not self._chunks:
+            self._chunks = _split(text)
+            self._reindex()
+            return
+        i, j = self._locate(start), self._locate(end)
+        merged = (self._chunks[i][:start - self._starts[i]] + text
+                  + self._chunks[j][end - self._starts[j]:])
+        self._chunks[i:j + 1] = _split(merged)
+        self._reindex()
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+상주 변환 서버. 프로세스를 한 번 띄워 두고 JSON 한 줄 단위 요청을 받아 변환합니다.
+매번 실행 파일을 새로 띄우는 비용(압축 해제, 인터프리터 시작) 없이 밀리초 단위로 응답합니다.
+
+    python main.py serve                       # 표준 입력/출력
+    python main.py serve --unix /tmp/tc.sock   # 유닉스 소켓
+    python main.py serve --tcp 127.0.0.1:8765  # TCP (로컬)
+
+요청 (한 줄에 JSON 하나):
+    {"id": 1, "op": "merge", "text": "..."}
+    {"id": 2, "op": "split", "texts": ["...", "..."]}   # 여러 건을 한 번에 (배치)
+    {"id": 3, "op": "pipeline", "steps": "trim,sentences", "text": "..."}  # 여러 단계 (pipeline.py)
+    {"id": 3, "op": "stats"}                            # 처리 통계
+    {"id": 4, "op": "ping"}
+응답 (한 줄에 JSON 하나, 끝난 순서대로 돌아오므로 id 로 짝을 맞춥니다):
+    {"id": 1, "ok": true, "result": "...", "latency_ms": 0.12, "convert_ms": 0.05}
+    {"id": 2, "ok": true, "results": ["...", "..."], ...}
+    {"id": 5, "ok": false, "error": "..."}
+"""
+import asyncio
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pipeline
+from converter import STREAM_CONVERTERS
+
+# 이보다 짧은 (글자 수) 요청은 작업 프로세스로 보내지 않고 바로 변환합니다.
+# 작은 입력은 프로세스 간 전달 비용이 변환 시간보다 큽니다.
+INLINE_LIMIT = 1 << 16
+# 배치 요청을 작업 프로세스로 나누어 보낼 때 한 묶음의 최대 글자 수
+GROUP_CHARS = 1 << 20
+# 요청 한 줄의 최대 크기 (바이트)
+MAX_REQUEST_BYTES = 64 << 20
+# 연결 하나에서 동시에 처리 중일 수 있는 요청 수
+MAX_PENDING = 256
+# 지연 시간 백분위수를 계산할 때 사용하는 최근 요청 수
+LATENCY_WINDOW = 10000
+
+
+def convert_text(operation: str, text: str) -> str:
+    # operation 은 변환 종류 또는 쉼표로 구분한 단계 목록입니다. (merge/split 은 기존 함수와 같은 결과)
+    return pipeline.compile_pipeline(operation).run(text)
+
+
+def convert_group(operation: str, texts):
+    # 작업 프로세스에서 여러 건을 한 번에 변환합니다. (결과 목록, 걸린 시간) 을 돌려줍니다.
+    began = time.perf_counter()
+    results = [convert_text(operation, text) for text in texts]
+    return results, time.perf_counter() - began
+
+
+def _warm_up():
+    # 작업 프로세스가 변환 모듈을 미리 불러오도록 하는 빈 작업
+    return convert_text('merge', ' ')
+
+
+class RequestError(Exception):
+    # 요청 형식이 잘못된 경우. 응답의 error 로 돌려줍니다.
+    pass
+
+
+def _too_large() -> bytes:
+    # 한 줄이 MAX_REQUEST_BYTES 보다 큰 요청에 대한 응답
+    return json.dumps({'id': None, 'ok': False, 'error': "요청이 너무 큽니다."},
+                      ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+class Metrics:
+    """
+    요청 수, 오류 수, 처리한 글자 수와 최근 요청의 지연 시간을 모읍니다.
+    """
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.started = time.time()
+        self.requests = 0
+        self.items = 0
+        self.errors = 0
+        self.chars_in = 0
+        self.chars_out = 0
+        self.offloaded = 0     # 작업 프로세스에서 변환한 요청 수
+        self._latencies = deque(maxlen=window)
+
+    def record(self, seconds: float, ok: bool):
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+        self._latencies.append(seconds)
+
+    def snapshot(self):
+        latencies = sorted(self._latencies)
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 3)
+
+        return {
+            'uptime_s': round(time.time() - self.started, 1),
+            'requests': self.requests,
+            'items': self.items,
+            'errors': self.errors,
+            'offloaded': self.offloaded,
+            'chars_in': self.chars_in,
+            'chars_out': self.chars_out,
+            'latency_ms': {
+                'p50': percentile(0.5),
+                'p90': percentile(0.9),
+                'p99': percentile(0.99),
+                'max': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            },
+        }
+
+
+class ConversionServer:
+    """
+    요청을 asyncio 로 동시에 받고, 큰 입력은 작업 프로세스 풀에서 변환합니다.
+    표준 입출력과 소켓 연결이 같은 서버(같은 풀, 같은 통계)를 공유합니다.
+    """
+    def __init__(self, jobs: int = None, inline_limit: int = INLINE_LIMIT):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.inline_limit = inline_limit
+        self.metrics = Metrics()
+        self._pool = None
+        self._unix_socket = None   # 이 서버가 만든 유닉스 소켓 (경로, 장치, inode)
+
+    async def start(self):
+        # 작업 프로세스를 미리 띄워 첫 요청이 시작 비용을 치르지 않게 합니다.
+        loop = asyncio.get_running_loop()
+        self._pool = ProcessPoolExecutor(max_workers=self.jobs)
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _warm_up)
+                               for _ in range(self.jobs)))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def _convert(self, operation: str, texts):
+        # (결과 목록, 변환 시간) - 작은 요청은 바로, 큰 요청은 묶음으로 나누어 작업 프로세스에서
+        if sum(map(len, texts)) <= self.inline_limit or self._pool is None:
+            return convert_group(operation, texts)
+        self.metrics.offloaded += 1
+        groups = [[]]
+        size = 0
+        for text in texts:
+            if groups[-1] and size + len(text) > GROUP_CHARS:
+                groups.append([])
+                size = 0
+            groups[-1].append(text)
+            size += len(text)
+        loop = asyncio.get_running_loop()
+        done = await asyncio.gather(*(loop.run_in_executor(self._pool, convert_group, operation, group)
+                                      for group in groups))
+        results = [result for group_results, _ in done for result in group_results]
+        return results, max(seconds for _, seconds in done)
+
+    async def handle(self, request) -> dict:
+        if not isinstance(request, dict):
+            raise RequestError("요청은 JSON 객체여야 합니다.")
+        operation = request.get('op')
+        if operation == 'ping':
+            return {}
+        if operation == 'stats':
+            return {'stats': self.metrics.snapshot()}
+        if operation == 'pipeline':
+            steps = request.get('steps')
+            if not isinstance(steps, (str, list)):
+                raise RequestError("steps 는 문자열 또는 목록이어야 합니다.")
+            operation = ','.join(pipeline.parse_steps(steps))
+        elif operation not in STREAM_CONVERTERS:
+            raise RequestError(f"알 수 없는 변환 종류: {operation}")
+        if 'texts' in request:
+            texts = request['texts']
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                raise RequestError("texts 는 문자열 목록이어야 합니다.")
+        elif isinstance(request.get('text'), str):
+            texts = [request['text']]
+        else:
+            raise RequestError("text 또는 texts 가 필요합니다.")
+
+        results, seconds = await self._convert(operation, texts)
+        self.metrics.items += len(texts)
+        self.metrics.chars_in += sum(map(len, texts))
+        self.metrics.chars_out += sum(map(len, results))
+        response = {'results': results} if 'texts' in request else {'result': results[0]}
+        response['convert_ms'] = round(seconds * 1000, 3)
+        return response
+
+    async def handle_line(self, line: bytes) -> bytes:
+        # 요청 한 줄 -> 응답 한 줄. 어떤 오류도 응답으로 돌려주고 연결은 유지합니다.
+        began = time.perf_counter()
+        request_id = None
+        try:
+            request = json.loads(line)
+            if isinstance(request, dict):
+                request_id = request.get('id')
+            response = {'id': request_id, 'ok': True}
+            response.update(await self.handle(request))
+        except (ValueError, RequestError) as e:
+            response = {'id': request_id, 'ok': False, 'error': str(e)}
+        except Exception as e:
+            response = {'id': request_id, 'ok': False, 'error': f"변환 실패: {e}"}
+        seconds = time.perf_counter() - began
+        self.metrics.record(seconds, response['ok'])
+        response['latency_ms'] = round(seconds * 1000, 3)
+        return json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n'
+
+    async def serve_lines(self, lines, write):
+        """
+        lines (비동기 반복자) 에서 요청을 읽어 동시에 처리하고, 끝나는 대로 write 로 응답합니다.
+        입력이 끝나면 처리 중인 요청을 모두 마치고 돌아옵니다.
+        """
+        pending = asyncio.Semaphore(MAX_PENDING)
+        tasks = set()
+
+        async def respond(line):
+            try:
+                await write(await self.handle_line(line))
+            finally:
+                pending.release()
+
+        async for line in lines:
+            if not line.strip():
+                continue
+            await pending.acquire()
+            task = asyncio.create_task(respond(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _serve_connection(self, reader, writer):
+        async def lines():
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # 한 줄이 MAX_REQUEST_BYTES 보다 큼: 오류를 알리고 연결을 닫습니다.
+                    writer.write(_too_large())
+                    return
+                if not line:
+                    return
+                yield line
+
+        async def write(data):
+            writer.write(data)
+            await writer.drain()
+
+        try:
+            await self.serve_lines(lines(), write)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve_stdio(self):
+        # 표준 입력에서 요청을 읽고 표준 출력으로 응답합니다. 입력이 끝나면 돌아옵니다.
+        loop = asyncio.get_running_loop()
+        stdin, stdout = sys.stdin.fileno(), sys.stdout.buffer
+        received = asyncio.Queue()
+
+        def read_stdin():
+            # 윈도우에서도 동작하도록 파이프 대신 데몬 스레드에서 읽습니다. 종료할 때 읽기가
+            # 끝나기를 기다리지 않도록, 잠금을 쓰는 sys.stdin 대신 파일 디스크립터에서 바로 읽습니다.
+            while True:
+                data = os.read(stdin, 1 << 16)
+                loop.call_soon_threadsafe(received.put_nowait, data)
+                if not data:
+                    return
+
+        async def lines():
+            # 읽은 조각마다 새로 읽은 부분에서만 줄바꿈을 찾고, 끝나지 않은 줄은 조각으로 모아 둡니다.
+            # MAX_REQUEST_BYTES 보다 긴 줄은 오류를 알리고 다음 줄바꿈까지 버립니다.
+            parts, size = [], 0
+            skipping = False
+            while True:
+                data = await received.get()
+                if not data:
+                    break
+                start = 0
+                while True:
+                    end = data.find(b'\n', start)
+                    if end < 0:
+                        break
+                    if skipping:
+                        skipping = False
+                    elif size + end - start > MAX_REQUEST_BYTES:
+                        await write(_too_large())
+                    else:
+                        parts.append(data[start:end])
+                        yield b''.join(parts)
+                    parts, size = [], 0
+                    start = end + 1
+                if skipping or start == len(data):
+                    continue
+                parts.append(data[start:])
+                size += len(data) - start
+                if size > MAX_REQUEST_BYTES:
+                    await write(_too_large())
+                    parts, size = [], 0
+                    skipping = True
+            if parts:
+                yield b''.join(parts)
+
+        async def write(data):
+            stdout.write(data)
+            stdout.flush()
+
+        threading.Thread(target=read_stdin, daemon=True).start()
+        await self.serve_lines(lines(), write)
+
+    async def start_unix(self, path: str):
+        """
+        path 에 유닉스 소켓을 만들어 기다립니다. 이전에 비정상 종료되어 남은 소켓 (연결을 받지 않는
+        소켓) 만 지우고, 다른 서버가 쓰고 있는 소켓이나 소켓이 아닌 파일이 있으면 FileExistsError.
+        """
+        try:
+            mode = os.lstat(path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(f"소켓이 아닌 파일이 이미 있습니다: {path}")
+            if _socket_in_use(path):
+                raise FileExistsError(f"다른 서버가 사용 중인 소켓입니다: {path}")
+            os.remove(path)
+        listener = await asyncio.start_unix_server(self._serve_connection, path,
+                                                   limit=MAX_REQUEST_BYTES)
+        info = os.lstat(path)
+        self._unix_socket = (path, info.st_dev, info.st_ino)
+        return listener
+
+    def remove_unix_socket(self):
+        # start_unix 로 만든 소켓 파일을 지웁니다. 그 사이 다른 서버가 같은 경로에 만든 소켓은 두고 갑니다.
+        if self._unix_socket is None:
+            return
+        path, dev, ino = self._unix_socket
+        self._unix_socket = None
+        try:
+            info = os.lstat(path)
+        except FileNotFoundError:
+            return
+        if (info.st_dev, info.st_ino) == (dev, ino):
+            os.remove(path)
+
+    async def start_tcp(self, host: str, port: int):
+        return await asyncio.start_server(self._serve_connection, host, port,
+                                          limit=MAX_REQUEST_BYTES)
+
+
+def _socket_in_use(path: str) -> bool:
+    # path 의 유닉스 소켓에 접속해 봅니다. 접속을 거부하면 기다리는 서버가 없는 (남은) 소켓입니다.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(1.0)
+        try:
+            probe.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+        except OSError:
+            # 권한이 없거나 응답이 없으면 지우지 않도록 사용 중으로 봅니다.
+            return True
+    return True
+
+
+def parse_address(text: str):
+    # 'HOST:PORT' 또는 'PORT' -> (host, port). 호스트를 생략하면 127.0.0.1 (로컬에서만 접속)
+    host, _, port = text.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+async def serve(stdio: bool = True, unix_path: str = None, tcp_address: str = None,
+                jobs: int = None, inline_limit: int = INLINE_LIMIT, log=None):
+    """
+    서버를 실행합니다. 소켓이 없으면 표준 입력이 끝날 때 종료하고,
+    소켓이 있으면 중단(Ctrl+C)될 때까지 실행합니다. 종료 시 통계를 돌려줍니다.
+    """
+    log = log or (lambda message: print(message, file=sys.stderr, flush=True))
+    server = ConversionServer(jobs, inline_limit)
+    listeners = []
+
+    async def run():
+        if stdio:
+            await server.serve_stdio()
+        if listeners:
+            await asyncio.gather(*(listener.serve_forever() for listener in listeners))
+
+    # SIGTERM 을 받아도 소켓 파일과 작업 프로세스를 정리하고 끝냅니다.
+    stop = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    except (NotImplementedError, AttributeError):
+        pass
+    try:
+        await server.start()
+        if unix_path:
+            listeners.append(await server.start_unix(unix_path))
+            log(f"유닉스 소켓 대기 중: {unix_path}")
+        if tcp_address:
+            listener = await server.start_tcp(*parse_address(tcp_address))
+            listeners.append(listener)
+            host, port = listener.sockets[0].getsockname()[:2]
+            log(f"TCP 대기 중: {host}:{port}")
+        log(f"준비 완료 (작업 프로세스 {server.jobs}개)")
+        main = asyncio.ensure_future(run())
+        stopped = asyncio.ensure_future(stop.wait())
+        await asyncio.wait((main, stopped), return_when=asyncio.FIRST_COMPLETED)
+        stopped.cancel()
+        if main.done():
+            main.result()
+        else:
+            main.cancel()
+    finally:
+        for listener in listeners:
+            listener.close()
+        server.remove_unix_socket()
+        server.close()
+    return server.metrics.snapshot()
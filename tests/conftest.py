@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 테스트는 저장소 최상위의 모듈들(converter, batch, ...)을 바로 import 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
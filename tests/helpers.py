@@ -0,0 +1,27 @@
+"""
+테스트에서 함께 쓰는 무작위 입력 생성 함수와 기준 변환.
+"""
+from converter import merge_sentences_to_paragraph, split_paragraph_to_sentences
+
+WHOLE = {'merge': merge_sentences_to_paragraph, 'split': split_paragraph_to_sentences}
+# 무작위 입력을 만들 때 쓰는 조각. 줄바꿈 종류, 공백 종류, 한글/영문을 섞습니다.
+PIECES = ['가', '나다', 'a', 'bc', ' ', '  ', '\t', '\n', '\r', '\r\n', '\n\n', ' \n', '　',
+          '\xa0', '\x0b', '\x0c', '\x85', ' ', '다.', '요?', 'Dr.', '1.', '"', ' 라고 ']
+# bytes 경로에서 다루는 입력 (bytes.splitlines() 와 str.splitlines() 가 같게 나누는 글자만)
+BYTES_PIECES = ['가', '나다', 'a', 'bc', ' ', '  ', '\t', '\n', '\r', '\r\n', '\n\n', ' \n', '다.']
+
+
+def random_text(rng, pieces=PIECES, size=60):
+    return ''.join(rng.choices(pieces, k=rng.randint(0, size)))
+
+
+def random_chunks(rng, data):
+    # data 를 무작위 위치에서 나눈 조각들 (빈 조각 포함)
+    cuts = sorted(rng.choices(range(len(data) + 1), k=rng.randint(0, 6)))
+    return [data[a:b] for a, b in zip([0] + cuts, cuts + [len(data)])]
+
+
+def whole_bytes(operation, text, encoding):
+    # 문자열 전체를 변환해 파일로 썼을 때의 바이트 (빈 결과면 BOM 도 쓰지 않음)
+    result = WHOLE[operation](text)
+    return result.encode(encoding) if result else b''
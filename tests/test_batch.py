@@ -0,0 +1,88 @@
+"""
+일괄 처리 (batch) 의 테스트. 줄 경계에서 나눈 조각을 이어 붙인 결과가 전체 변환과 같은지 확인합니다.
+"""
+import os
+import random
+import stat
+
+import pytest
+
+import batch
+from helpers import BYTES_PIECES, WHOLE, random_text, whole_bytes
+
+
+def test_check_name_template():
+    batch.check_name_template(batch.DEFAULT_NAME_TEMPLATE)
+    for bad in ("{foo}.txt", "{stem", "{stem.x}", "{0}"):
+        with pytest.raises(ValueError):
+            batch.check_name_template(bad)
+
+
+@pytest.mark.parametrize('encoding,output_encoding', [
+    ('utf-8', None), ('cp949', None), ('utf-8-sig', None), ('utf-8', 'utf-8-sig'),
+])
+def test_batch_parts_stitch_to_whole_result(tmp_path, encoding, output_encoding):
+    rng = random.Random(f"batch-{encoding}-{output_encoding}")
+    (tmp_path / "in").mkdir()
+    texts = {}
+    for i in range(6):
+        # 앞부분이 빈 줄뿐이라 첫 조각의 결과가 비는 경우도 넣습니다.
+        text = '\n' * rng.randint(0, 80) * (i % 2) + random_text(rng, BYTES_PIECES, 300)
+        path = tmp_path / "in" / f"f{i}.txt"
+        with open(path, 'w', encoding=encoding, newline='') as f:
+            f.write(text)
+        texts[f"f{i}"] = text
+    for operation in WHOLE:
+        records = batch.run_batch([str(tmp_path / "in")], operation, output_dir=str(tmp_path / "out"),
+                                  jobs=2, part_size=32, encoding=encoding,
+                                  output_encoding=output_encoding)
+        assert [r['status'] for r in records] == ['ok'] * len(texts)
+        assert any(r['parts'] > 1 for r in records)
+        for stem, text in texts.items():
+            data = (tmp_path / "out" / f"{stem}_{operation}.txt").read_bytes()
+            assert data == whole_bytes(operation, text, output_encoding or encoding), stem
+
+
+@pytest.mark.parametrize('encoding', ['utf-8-sig', None])
+def test_batch_keeps_feff_at_part_start(tmp_path, encoding):
+    # 조각이 U+FEFF 로 시작해도 BOM 으로 보아 지우지 않습니다.
+    text = '﻿가나\n﻿다\n' * 20
+    (tmp_path / "a.txt").write_text(text, encoding='utf-8-sig')
+    for operation in WHOLE:
+        records = batch.run_batch([str(tmp_path / "a.txt")], operation, jobs=1, part_size=8,
+                                  encoding=encoding)
+        assert records[0]['status'] == 'ok' and records[0]['parts'] > 1
+        data = (tmp_path / f"a_{operation}.txt").read_bytes()
+        assert data == whole_bytes(operation, text, 'utf-8-sig')
+
+
+def test_batch_rerun_skips_previous_outputs(tmp_path):
+    (tmp_path / "x.txt").write_text("가\n나\n", encoding='utf-8')
+    for _ in range(2):
+        for operation in WHOLE:
+            records = batch.run_batch([str(tmp_path)], operation, if_exists='overwrite', jobs=1)
+            assert [(r['input'], r['status']) for r in records] == [(str(tmp_path / "x.txt"), 'ok')]
+    assert sorted(os.listdir(tmp_path)) == ['x.txt', 'x_merge.txt', 'x_split.txt']
+
+
+def test_batch_reports_missing_inputs(tmp_path):
+    (tmp_path / "a.txt").write_text("가\n", encoding='utf-8')
+    (tmp_path / "empty").mkdir()
+    paths = [str(tmp_path / "a.txt"), str(tmp_path / "none.txt"), str(tmp_path / "*.md"),
+             str(tmp_path / "empty")]
+    records = batch.run_batch(paths, 'merge', jobs=1)
+    assert sorted((r['input'], r['status']) for r in records) == sorted(
+        [(paths[0], 'ok')] + [(path, 'failed') for path in paths[1:]])
+
+
+def test_batch_output_mode_follows_umask(tmp_path):
+    (tmp_path / "a.txt").write_text("가\n나\n" * 100, encoding='utf-8')
+    umask = os.umask(0o022)
+    try:
+        for part_size in (1 << 20, 64):
+            records = batch.run_batch([str(tmp_path / "a.txt")], 'split', if_exists='overwrite',
+                                      jobs=1, part_size=part_size)
+            assert records[0]['status'] == 'ok'
+            assert stat.S_IMODE(os.stat(tmp_path / "a_split.txt").st_mode) == 0o644
+    finally:
+        os.umask(umask)
@@ -0,0 +1,53 @@
+"""
+벤치마크 (bench) 의 옵션 확인과 기준 결과 비교.
+"""
+import json
+
+import pytest
+
+import bench
+
+
+@pytest.mark.parametrize('argv', [
+    ['--kinds', 'korean,nope'],
+    ['--methods', 'stream,mmmap'],
+    ['--operations', 'merge,splt'],
+    ['--sizes', '1X'],
+    ['--repeat', '0'],
+])
+def test_main_rejects_bad_options(capsys, argv):
+    assert bench.main(argv) == 2
+    assert capsys.readouterr().err
+
+
+def test_main_runs_and_compares(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(bench, 'MIN_MEASURE_SECONDS', 0)
+    saved = tmp_path / "base.json"
+    argv = ['--sizes', '4K', '--kinds', 'korean', '--methods', 'stream',
+            '--operations', 'merge', '--repeat', '1']
+    assert bench.main(argv + ['--save', str(saved)]) == 0
+    results = json.loads(saved.read_text(encoding='utf-8'))
+    assert list(results) == ['korean/4K/stream/merge']
+    # 기준보다 크게 빨랐던 것으로 고치면 회귀로 보고합니다.
+    results['korean/4K/stream/merge']['mb_per_s'] *= 1000
+    saved.write_text(json.dumps(results), encoding='utf-8')
+    assert bench.main(argv + ['--baseline', str(saved), '--min-check-size', '1K']) == 1
+    assert "[회귀]" in capsys.readouterr().out
+
+
+def test_compare_skips_small_inputs_and_allows_slack():
+    base = {'k': {'size': 1 << 20, 'mb_per_s': 100.0, 'peak_rss': 100 << 20}}
+    slow = {'k': {'size': 1 << 20, 'mb_per_s': 50.0, 'peak_rss': 100 << 20}}
+    assert bench.compare(slow, base, 0.1, 2 << 20) == []
+    assert len(bench.compare(slow, base, 0.1, 1 << 20)) == 1
+    grown = {'k': {'size': 1 << 20, 'mb_per_s': 100.0, 'peak_rss': 115 << 20}}
+    assert bench.compare(grown, base, 0.1, 1 << 20) == []
+    grown['k']['peak_rss'] = 200 << 20
+    assert len(bench.compare(grown, base, 0.1, 1 << 20)) == 1
+
+
+def test_parse_and_format_size():
+    assert bench.parse_size('16M') == 16 << 20
+    assert bench.parse_size('1.5kb') == 1536
+    assert bench.format_size(64 << 20) == '64M'
+    assert bench.format_size(1000) == '1000'
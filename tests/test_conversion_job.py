@@ -0,0 +1,85 @@
+"""
+GUI 작업 스레드 변환 (main.ConversionJob) 의 진행률/취소/오류 메시지.
+"""
+import os
+import subprocess
+import sys
+
+import main
+from helpers import WHOLE
+
+
+def messages(job, timeout=30):
+    # 작업이 끝날 때까지 큐의 메시지를 모읍니다.
+    out = []
+    while True:
+        kind, value = job.queue.get(timeout=timeout)
+        out.append((kind, value))
+        if kind != 'progress':
+            return out
+
+
+def test_done_with_progress():
+    text = '가나 다\n\n라\r\n' * 1000
+    for operation, whole in WHOLE.items():
+        job = main.ConversionJob(operation, text, chunk_size=100)
+        job.start()
+        out = messages(job)
+        progress = [value for kind, value in out if kind == 'progress']
+        assert progress == sorted(progress) and progress[-1] == 1.0
+        assert len(progress) == len(text) // 100
+        kind, result = out[-1]
+        assert kind == 'done'
+        assert ''.join(result.chunks()) == whole(text)
+        assert job.seconds > 0
+
+
+def test_cache_is_checked_in_the_job():
+    cache = main.ResultCache()
+    text = '가나 다\n라\n' * 100
+    first = main.ConversionJob('merge', text, cache=cache)
+    first.start()
+    kind, result = messages(first)[-1]
+    assert kind == 'done' and not first.cached
+    second = main.ConversionJob('merge', text, cache=cache)
+    second.start()
+    assert messages(second) == [('done', result)] and second.cached
+    # 취소된 작업의 결과는 캐시에 넣지 않습니다.
+    third = main.ConversionJob('split', text, cache=cache)
+    third.cancel()
+    third.start()
+    assert messages(third) == [('cancelled', None)]
+    assert cache.get((main.text_digest(text), 'split')) is None
+
+
+def test_cancel_while_running():
+    job = main.ConversionJob('merge', 'a b\n' * 500000, chunk_size=16)
+    job.start()
+    assert job.queue.get(timeout=30)[0] == 'progress'
+    job.cancel()
+    out = messages(job)
+    assert job.cancelled
+    assert out[-1] == ('cancelled', None)
+    # 취소하면 남은 청크는 변환하지 않습니다.
+    assert len(out) < 500000 * 4 // 16
+
+
+def test_cancel_before_start():
+    job = main.ConversionJob('split', 'a\nb\n')
+    job.cancel()
+    job.start()
+    assert messages(job) == [('cancelled', None)]
+
+
+def test_error_is_reported():
+    job = main.ConversionJob('nope', 'a\n')
+    job.start()
+    kind, error = messages(job)[-1]
+    assert kind == 'error' and isinstance(error, KeyError)
+
+
+def test_import_main_without_tkinter():
+    # 명령줄 모드와 작업 스레드는 tkinter 없이 동작해야 합니다.
+    code = "import sys, main; sys.exit('tkinter' in sys.modules)"
+    folder = os.path.dirname(os.path.abspath(main.__file__))
+    assert subprocess.run([sys.executable, '-c', code], cwd=folder).returncode == 0
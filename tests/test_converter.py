@@ -0,0 +1,64 @@
+"""
+converter.py 의 스트리밍 변환기와 명령줄 변환 (main.py merge/split).
+"""
+import random
+
+import pytest
+
+import main
+from converter import STREAM_CONVERTERS
+from helpers import BYTES_PIECES, WHOLE, random_chunks, random_text
+
+
+@pytest.mark.parametrize('operation', sorted(WHOLE))
+def test_stream_matches_whole_for_str_chunks(operation):
+    # 청크 경계가 '\r\n' 이나 연속 공백 사이에 걸려도 전체를 한 번에 변환한 것과 같아야 합니다.
+    rng = random.Random(f"str-{operation}")
+    for _ in range(3000):
+        text = random_text(rng)
+        chunks = random_chunks(rng, text)
+        assert ''.join(STREAM_CONVERTERS[operation](chunks)) == WHOLE[operation](text), chunks
+
+
+@pytest.mark.parametrize('operation', sorted(WHOLE))
+@pytest.mark.parametrize('encoding', ['utf-8', 'cp949'])
+def test_stream_matches_whole_for_bytes_chunks(operation, encoding):
+    rng = random.Random(f"bytes-{operation}-{encoding}")
+    for _ in range(2000):
+        text = random_text(rng, BYTES_PIECES)
+        data = text.encode(encoding)
+        chunks = random_chunks(rng, data)
+        result = b''.join(STREAM_CONVERTERS[operation](chunks))
+        assert result == WHOLE[operation](text).encode(encoding), chunks
+
+
+def test_crlf_split_across_chunks():
+    assert ''.join(STREAM_CONVERTERS['split'](['a\r', '\nb'])) == 'a\n\nb'
+    assert ''.join(STREAM_CONVERTERS['merge'](['a \r', '\n  b'])) == 'a b'
+    assert b''.join(STREAM_CONVERTERS['split']([b'a\r', b'\r\nb'])) == b'a\n\nb'
+
+
+@pytest.mark.parametrize('operation', sorted(WHOLE))
+def test_cli_convert_stream(tmp_path, monkeypatch, operation):
+    text = ' 가나\r\n\r\n다  라\n\n\n마\n'
+    src, dst = tmp_path / "in.txt", tmp_path / "out.txt"
+    src.write_bytes(text.encode('utf-8'))
+    # 입력을 '-'(표준 입력)로 주면 메모리 매핑 대신 청크 단위 스트리밍 경로로 변환합니다.
+    with open(src, encoding='utf-8') as stdin:
+        monkeypatch.setattr('sys.stdin', stdin)
+        assert main.run_cli([operation, '-', str(dst), '--chunk-size', '3']) == 0
+    assert dst.read_bytes() == WHOLE[operation](text).encode('utf-8')
+
+
+@pytest.mark.parametrize('argv', [
+    ['merge', 'in.txt', 'out.txt', '--encoding', 'nope'],
+    ['split', 'in.txt', 'out.txt', '--output-encoding', 'nope'],
+    ['pipe', 'trim', 'in.txt', 'out.txt', '--encoding', 'nope'],
+    ['merge', 'in.txt', 'out.txt', '--chunk-size', '0'],
+])
+def test_cli_rejects_bad_options(tmp_path, monkeypatch, capsys, argv):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "in.txt").write_text("a\nb\n", encoding='utf-8')
+    assert main.run_cli(argv) == 2
+    assert not (tmp_path / "out.txt").exists()
+    assert capsys.readouterr().err
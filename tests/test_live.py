@@ -0,0 +1,71 @@
+"""
+실시간 미리보기용 증분 변환 (live) 의 테스트.
+"""
+import random
+
+import pytest
+
+import live
+from helpers import WHOLE, random_text
+
+
+@pytest.mark.parametrize('operation', sorted(WHOLE))
+def test_line_index_patch_matches_render(operation):
+    rng = random.Random(f"live-{operation}")
+    lines = random_text(rng, size=200).split('\n')
+    live.LineIndex.BLOCK_SIZE, old_block = 4, live.LineIndex.BLOCK_SIZE
+    try:
+        index = live.LineIndex(lines)
+        for _ in range(500):
+            before = index.render(operation)
+            lo = rng.randint(0, len(lines))
+            hi = rng.randint(lo, min(len(lines), lo + 5))
+            new = random_text(rng, size=20).split('\n')[:rng.randint(0, 4)]
+            start, length, text = index.replace(lo, hi, new, operation)
+            lines[lo:hi] = new
+            after = before[:start] + text + before[start + length:]
+            assert after == index.render(operation) == WHOLE[operation]('\n'.join(lines))
+    finally:
+        live.LineIndex.BLOCK_SIZE = old_block
+
+
+def test_record_edit_covers_composed_edits():
+    # 입력창에 여러 번 고친 뒤, 합쳐진 범위만 인덱스에 반영하면 입력창과 같아야 합니다.
+    rng = random.Random("record-edit")
+    for _ in range(300):
+        indexed = [str(i) for i in range(rng.randint(1, 12))]
+        current = list(indexed)
+        dirty = None
+        for _ in range(rng.randint(1, 6)):
+            # 입력창 line 줄부터 old_count+1 줄을 new_count+1 줄로 바꿉니다.
+            line = rng.randint(1, len(current))
+            old_count = rng.randint(0, len(current) - line)
+            new_count = rng.randint(0, 3)
+            current[line - 1:line + old_count] = [f"n{rng.random()}" for _ in range(new_count + 1)]
+            dirty = live.record_edit(dirty, line, old_count, new_count)
+        lo, old_hi, cur_hi = dirty
+        assert indexed[:lo] + current[lo:cur_hi] + indexed[old_hi:] == current
+
+
+def test_record_edit_keeps_full_rebuild():
+    assert live.record_edit(live.FULL_REBUILD, 3, 1, 0) is live.FULL_REBUILD
+    assert live.record_edit(None, 3, 1, 0) == (2, 4, 3)
+
+
+def test_text_digest_is_chunk_size_independent(monkeypatch):
+    text = '가a\ud800' * 1000
+    whole = live.text_digest(text)
+    monkeypatch.setattr(live, 'DIGEST_CHUNK', 7)
+    assert live.text_digest(text) == whole
+    assert live.text_digest(text + 'x') != whole
+
+
+def test_result_cache_limits():
+    cache = live.ResultCache(max_entries=2, max_chars=10)
+    cache.put('a', '12345')
+    cache.put('b', '12345')
+    cache.get('a')
+    cache.put('c', '1')
+    assert cache.get('b') is None and cache.get('a') == '12345'
+    cache.put('d', 'x' * 11)
+    assert cache.get('d') is None
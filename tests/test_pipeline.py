@@ -0,0 +1,77 @@
+"""
+여러 단계 변환 (pipeline) 의 테스트. 청크를 어떻게 나누어도 결과가 같은지 확인합니다.
+"""
+import random
+
+import pytest
+
+import main
+import pipeline
+from helpers import WHOLE, random_chunks, random_text
+
+
+def test_pipeline_single_step_matches_converter():
+    rng = random.Random("pipeline")
+    for _ in range(1000):
+        text = random_text(rng)
+        chunks = random_chunks(rng, text)
+        for operation, whole in WHOLE.items():
+            pipe = pipeline.compile_pipeline(operation)
+            assert pipe.run(text) == ''.join(pipe.iter(chunks)) == whole(text)
+
+
+def test_pipeline_is_chunk_invariant():
+    rng = random.Random("pipeline-chunks")
+    for _ in range(1000):
+        text = random_text(rng)
+        steps = rng.choices(list(pipeline.STEPS), k=rng.randint(1, 4))
+        pipe = pipeline.compile_pipeline(steps)
+        assert ''.join(pipe.iter(random_chunks(rng, text))) == pipe.run(text), steps
+        assert list(pipeline.iter_lines(random_chunks(rng, text))) == text.splitlines()
+
+
+def test_segment_sentences():
+    text = ('오늘은 맑다. 내일은 비가 올까요? Dr. Kim met J. Smith in the U.S. yesterday. '
+            '"좋아요." 라고 말했다.\n1. 항목입니다\n\n새 문단!')
+    assert pipeline.segment_sentences(text) == [
+        '오늘은 맑다.', '내일은 비가 올까요?', 'Dr. Kim met J. Smith in the U.S. yesterday.',
+        '"좋아요." 라고 말했다.', '1. 항목입니다', '새 문단!',
+    ]
+    assert pipeline.compile_pipeline('sentences').run('가다.나\n\n다') == '가다.\n나\n\n다'
+
+
+def test_sentences_bounded_rescan_matches_full_rescan(monkeypatch):
+    # 끝나지 않은 문장의 뒷부분만 다시 검사해도 전체를 다시 검사한 것과 같아야 합니다.
+    rng = random.Random("sentences")
+    pieces = ['a', '가', ' ', '  ', '\n', '\n\n', '.', '다.', '요?', 'Dr.', '1.', 'U.S.', 'J.',
+              '"', '”', ' 라고 ', '…', '!', '12', 'aaaaaaaaaa']
+    for _ in range(2000):
+        lines = random_text(rng, pieces, size=150).split('\n')
+        monkeypatch.setattr(pipeline, 'OUTPUT_LINES', 1 << 30)
+        monkeypatch.setattr(pipeline, 'RESCAN_TAIL', 1 << 30)
+        want = list(pipeline.iter_sentences(lines))
+        monkeypatch.setattr(pipeline, 'OUTPUT_LINES', rng.randint(1, 4))
+        monkeypatch.setattr(pipeline, 'RESCAN_TAIL', rng.randint(8, 16))
+        assert list(pipeline.iter_sentences(lines)) == want, lines
+
+
+def test_sentences_long_paragraph_without_punctuation():
+    line = "로그 항목 값 처리 완료 상태 정상 다음 단계로 진행 중"
+    text = '\n'.join([line] * 20000)
+    assert pipeline.compile_pipeline('sentences').run(text) == ' '.join([line] * 20000)
+
+
+def test_parse_steps_errors():
+    with pytest.raises(ValueError):
+        pipeline.parse_steps('trim,nope')
+    with pytest.raises(ValueError):
+        pipeline.parse_steps(' , ')
+
+
+def test_cli_pipe_matches_run(tmp_path):
+    text = ' 가나 다.  라\r\n\n마요? 바\n' * 50
+    src, dst = tmp_path / "in.txt", tmp_path / "out.txt"
+    src.write_bytes(text.encode('utf-8'))
+    assert main.run_cli(['pipe', 'trim,sentences', str(src), str(dst), '--chunk-size', '7']) == 0
+    want = pipeline.compile_pipeline('trim,sentences').run(text)
+    assert dst.read_text(encoding='utf-8') == want
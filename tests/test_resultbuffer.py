@@ -0,0 +1,26 @@
+"""
+결과 버퍼 (resultbuffer) 의 테스트. 조각으로 나누어 보관해도 문자열 하나처럼 동작하는지 확인합니다.
+"""
+import random
+
+from helpers import random_text
+from resultbuffer import ResultBuffer
+
+
+def test_result_buffer_matches_str(monkeypatch):
+    monkeypatch.setattr('resultbuffer.MAX_CHUNK', 7)
+    rng = random.Random("buffer")
+    text = random_text(rng, ['ab', '\n', '가', ' '], size=80)
+    buffer = ResultBuffer([text[:30], text[30:]])
+    for _ in range(300):
+        start = rng.randint(0, len(text))
+        end = rng.randint(start, len(text))
+        assert buffer.slice(start, end) == text[start:end]
+        pos = rng.randint(0, len(text))
+        assert buffer.line_start(pos) == text.rfind('\n', 0, pos) + 1
+        line_end = text.find('\n', pos)
+        assert buffer.line_end(pos) == (len(text) if line_end < 0 else line_end)
+        new = random_text(rng, ['c', '\n'], size=10)
+        buffer.replace(start, end, new)
+        text = text[:start] + new + text[end:]
+        assert len(buffer) == len(text) and ''.join(buffer.chunks()) == text
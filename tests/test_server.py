@@ -0,0 +1,90 @@
+"""
+상주 변환 서버 (server) 의 테스트: 표준 입출력 줄 나누기, 유닉스 소켓 파일 정리.
+"""
+import asyncio
+import json
+import os
+import socket
+
+import pytest
+
+import server
+
+needs_unix = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="유닉스 소켓 없음")
+
+
+def test_serve_stdio_splits_lines_and_rejects_large_requests(monkeypatch):
+    monkeypatch.setattr(server, 'MAX_REQUEST_BYTES', 100)
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b'{"id": 1, "op": "ping"}\n' + b'x' * 300 + b'\n'
+             + b'{"id": 2, "op": "merge", "text": "a\\n b"}\n'
+             + b'{"id": 3, "op": "merge", "text": "' + b'a' * 150 + b'"}\n{"id": 4, "op": "ping"}')
+    os.close(write_fd)
+    written = []
+
+    class Stdin:
+        def fileno(self):
+            return read_fd
+
+    class Stdout:
+        buffer = type('Buffer', (), {'write': staticmethod(written.append),
+                                     'flush': staticmethod(lambda: None)})
+
+    monkeypatch.setattr('sys.stdin', Stdin())
+    monkeypatch.setattr('sys.stdout', Stdout())
+    try:
+        asyncio.run(server.ConversionServer(jobs=1).serve_stdio())
+    finally:
+        os.close(read_fd)
+    responses = [json.loads(line) for line in b''.join(written).splitlines()]
+    assert sorted(r['id'] for r in responses if r['ok']) == [1, 2, 4]
+    assert [r['id'] for r in responses if not r['ok']] == [None, None]
+    assert [r['result'] for r in responses if r['id'] == 2] == ['a b']
+
+
+@needs_unix
+def test_start_unix_keeps_regular_file(tmp_path):
+    path = tmp_path / "not-a-socket"
+    path.write_text("data")
+    with pytest.raises(FileExistsError):
+        asyncio.run(server.ConversionServer(jobs=1).start_unix(str(path)))
+    assert path.read_text() == "data"
+
+
+@needs_unix
+def test_start_unix_refuses_live_socket_and_replaces_stale_one(tmp_path):
+    path = str(tmp_path / "s.sock")
+    with socket.socket(socket.AF_UNIX) as live:
+        live.bind(path)
+        live.listen()
+        with pytest.raises(FileExistsError):
+            asyncio.run(server.ConversionServer(jobs=1).start_unix(path))
+        assert os.path.exists(path)
+    # 닫힌 소켓의 파일만 남은 경우 (비정상 종료) 는 지우고 새로 만듭니다.
+
+    async def start_and_stop():
+        conversion = server.ConversionServer(jobs=1)
+        listener = await conversion.start_unix(path)
+        listener.close()
+        conversion.remove_unix_socket()
+
+    asyncio.run(start_and_stop())
+    assert not os.path.exists(path)
+
+
+@needs_unix
+def test_shutdown_keeps_socket_of_another_server(tmp_path):
+    path = str(tmp_path / "s.sock")
+
+    async def replaced_while_running():
+        conversion = server.ConversionServer(jobs=1)
+        listener = await conversion.start_unix(path)
+        listener.close()
+        # 다른 서버가 같은 경로에 새 소켓을 만든 경우 (먼저 만들어 두어 inode 가 겹치지 않게 함)
+        with socket.socket(socket.AF_UNIX) as other:
+            other.bind(path + ".new")
+            os.replace(path + ".new", path)
+            conversion.remove_unix_socket()
+            return os.path.exists(path)
+
+    assert asyncio.run(replaced_while_running())
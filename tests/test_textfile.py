@@ -0,0 +1,70 @@
+"""
+파일 입출력 (textfile) 의 테스트: 인코딩 감지, 바이트 그대로 변환하는 경로와 디코딩 경로.
+"""
+import random
+
+import pytest
+
+import main
+import textfile
+from helpers import BYTES_PIECES, PIECES, WHOLE, random_text, whole_bytes
+
+
+def test_detect_cp949_extension_after_sample(tmp_path):
+    path = tmp_path / "cp.txt"
+    text = '가나다 라마바\n' * 14000 + '똠방각하\n'
+    path.write_bytes(text.encode('cp949'))
+    assert textfile.sniff_encoding(str(path)) == 'cp949'
+    dst = tmp_path / "out.txt"
+    textfile.convert_file(str(path), str(dst), 'merge', output_encoding='utf-8')
+    assert dst.read_bytes() == WHOLE['merge'](text).encode('utf-8')
+
+
+def test_ascii_sample_is_inconclusive(tmp_path):
+    # 앞부분이 ASCII 뿐이면 utf-8 로 정하지 않고 뒤에 나오는 글자로 인코딩을 정합니다.
+    text = 'plain ascii line\n' * 7000 + '한글 줄\n'
+    path = tmp_path / "late.txt"
+    path.write_bytes(text.encode('cp949'))
+    assert textfile.guess_encoding(b'abc\n') is None
+    assert textfile.sniff_encoding(str(path)) == 'cp949'
+    dst = tmp_path / "out.txt"
+    assert main.run_cli(['merge', str(path), str(dst), '--output-encoding', 'utf-8']) == 0
+    assert dst.read_bytes() == WHOLE['merge'](text).encode('utf-8')
+
+
+def test_bytes_path_rejects_invalid_input(tmp_path):
+    # 바이트 그대로 변환할 때도 지정한 인코딩에 맞지 않는 바이트는 그대로 옮기지 않습니다.
+    src = tmp_path / "in.txt"
+    src.write_bytes(b'abc\n' * 100 + '한글\n'.encode('cp949'))
+    for operation in WHOLE:
+        with pytest.raises(UnicodeDecodeError):
+            textfile.convert_file(str(src), str(tmp_path / "out.txt"), operation, 'utf-8')
+
+
+@pytest.mark.parametrize('argv', [['merge'], ['split'], ['pipe', 'trim']])
+def test_cli_refuses_same_input_and_output(tmp_path, capsys, argv):
+    path = tmp_path / "f.txt"
+    path.write_text("가\n나\n", encoding='utf-8')
+    assert main.run_cli(argv + [str(path), str(tmp_path / "." / "f.txt")]) == 2
+    assert path.read_text(encoding='utf-8') == "가\n나\n"
+    assert capsys.readouterr().err
+
+
+@pytest.mark.parametrize('encoding,output_encoding', [
+    ('utf-8', None), ('cp949', None), ('utf-8-sig', None), ('utf-8', 'utf-8-sig'),
+    ('cp949', 'utf-8'), ('utf-16', None),
+])
+def test_convert_file_matches_whole(tmp_path, encoding, output_encoding):
+    rng = random.Random(f"file-{encoding}-{output_encoding}")
+    src, dst = str(tmp_path / "in.txt"), str(tmp_path / "out.txt")
+    for _ in range(100):
+        pieces = PIECES if encoding.startswith('utf') else BYTES_PIECES + ['　']
+        text = random_text(rng, pieces)
+        with open(src, 'w', encoding=encoding, newline='') as f:
+            f.write(text)
+        for operation in WHOLE:
+            result = textfile.convert_file(src, dst, operation, encoding, output_encoding)
+            with open(dst, 'rb') as f:
+                data = f.read()
+            assert data == whole_bytes(operation, text, output_encoding or encoding)
+            assert result['bytes_written'] == len(data)
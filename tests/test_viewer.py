@@ -0,0 +1,39 @@
+"""
+결과 보기 창 (viewer) 의 테스트. 화면(DISPLAY)이 없으면 건너뜁니다.
+"""
+import pytest
+
+from resultbuffer import ResultBuffer
+
+tk = pytest.importorskip('tkinter')
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"화면을 열 수 없습니다: {e}")
+    root.geometry("300x200")
+    yield root
+    root.destroy()
+
+
+def test_select_all_copies_whole_buffer(root):
+    import tkinter.font as tkfont
+    from viewer import ResultViewer
+
+    view = ResultViewer(root, font=tkfont.nametofont('TkTextFont'))
+    view.pack(fill=tk.BOTH, expand=True)
+    text = '가나다 라마바 사아자. ' * 20000
+    view.set_buffer(ResultBuffer([text]))
+    root.update()
+    assert len(view.text.get("1.0", "end-1c")) < len(text)
+    view.text.event_generate('<<SelectAll>>')
+    view.text.event_generate('<<Copy>>')
+    assert root.clipboard_get() == text + "\n"
+    # 새 결과가 들어오면 전체선택은 풀립니다.
+    view.set_buffer(ResultBuffer(["짧은 결과"]))
+    root.update()
+    view.text.event_generate('<<Copy>>')
+    assert root.clipboard_get() == text + "\n"
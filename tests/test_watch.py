@@ -0,0 +1,96 @@
+"""
+폴더 감시 (watch) 의 테스트. 조금씩 덧붙이며 감시한 출력이 전체를 한 번에 변환한 것과 같은지 확인합니다.
+"""
+import codecs
+import json
+import os
+import random
+import shutil
+
+import pytest
+
+import textfile
+import watch
+from helpers import WHOLE, random_text, whole_bytes
+
+
+@pytest.mark.parametrize('encoding,output_encoding', [
+    ('utf-8', None), ('cp949', None), ('utf-8-sig', None), ('utf-8', 'utf-8-sig'),
+])
+def test_watch_resume_matches_whole(tmp_path, encoding, output_encoding):
+    # 조금씩 덧붙이며 감시하고, 가끔 체크포인트 저장 전에 중단된 것처럼 되돌려도
+    # 출력은 언제나 전체를 한 번에 변환한 것과 같아야 합니다.
+    rng = random.Random(f"watch-{encoding}-{output_encoding}")
+    pieces = ['가', 'a', ' ', '\n', '\r', '\r\n', '\n\n', '  ', '나다.', '\t', 'b c']
+    for operation in WHOLE:
+        folder = tmp_path / operation
+        shutil.rmtree(folder, ignore_errors=True)
+        (folder / "in").mkdir(parents=True)
+        src = folder / "in" / "a.txt"
+        dst = folder / "out" / f"a_{operation}.txt"
+        state = str(folder / "state.json")
+        src.write_bytes(b'')
+
+        def make_watcher():
+            return watch.Watcher([str(folder / "in")], operation, output_dir=str(folder / "out"),
+                                 encoding=encoding, output_encoding=output_encoding,
+                                 state_path=state)
+
+        watcher = make_watcher()
+        text = ''
+        for _ in range(40):
+            added = random_text(rng, pieces, 8)
+            data = added.encode(textfile.continuation_encoding(encoding))
+            if encoding == 'utf-8-sig' and not text:
+                data = codecs.BOM_UTF8 + data
+            with open(src, 'ab') as f:
+                f.write(data)
+            text += added
+            crash = added and rng.random() < 0.2 and os.path.exists(state)
+            if crash:
+                shutil.copy(state, state + '.bak')
+            records = watcher.poll()
+            assert all(r['status'] != 'failed' for r in records), records
+            if crash:
+                # 출력은 썼지만 체크포인트는 저장하지 못한 채 끝난 경우
+                shutil.copy(state + '.bak', state)
+                with open(dst, 'ab') as f:
+                    f.write(b'garbage')
+                watcher = make_watcher()
+                watcher.poll()
+            want = whole_bytes(operation, text, output_encoding or encoding)
+            assert (dst.read_bytes() if dst.exists() else b'') == want
+
+
+def test_last_line_end(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"ab\ncd\r\nef\r")
+    size = os.path.getsize(path)
+    # 맨 끝의 '\r' 은 뒤에 '\n' 이 올 수 있으므로 줄 끝이 아님
+    assert watch.last_line_end(str(path), 0, size) == 7
+    assert watch.last_line_end(str(path), 0, 6) == 3
+    assert watch.last_line_end(str(path), 8, size) == 8
+
+
+@pytest.mark.parametrize('output_encoding', [None, 'utf-8'])
+def test_watch_guesses_encoding_after_ascii_head(tmp_path, output_encoding):
+    # 처음에는 ASCII 뿐이라 인코딩을 정하지 않고, 한글이 붙은 뒤에 CP949 로 정합니다.
+    src = tmp_path / "in" / "a.txt"
+    src.parent.mkdir()
+    state = tmp_path / "state.json"
+    watcher = watch.Watcher([str(src.parent)], 'merge', output_dir=str(tmp_path / "out"),
+                            output_encoding=output_encoding, state_path=str(state))
+    text = ''
+    # 마지막 줄바꿈 없는 줄에 한글 첫 바이트만 쓰인 경우도 지나갑니다.
+    for added in (b'', b'plain line\n' * 3, '\n한글'.encode('cp949')[:2], '한글'.encode('cp949')[1:],
+                  '이어진 줄\n'.encode('cp949')):
+        with open(src, 'ab') as f:
+            f.write(added)
+        records = watcher.poll()
+        assert all(r['status'] != 'failed' for r in records), records
+        entry = json.loads(state.read_text(encoding='utf-8'))['files'][os.path.abspath(src)]
+        text = src.read_bytes()
+        ascii_lines = b'\n' not in text or text[:text.rindex(b'\n')].isascii()
+        assert entry['encoding'] == (None if ascii_lines else 'cp949')
+    want = whole_bytes('merge', text.decode('cp949'), output_encoding or 'cp949')
+    assert (tmp_path / "out" / "a_merge.txt").read_bytes() == want
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+파일 입출력: 인코딩 감지, 메모리 매핑 읽기, 바이트 단위 변환.
+
+UTF-8, CP949, EUC-KR 처럼 ASCII 와 호환되는 인코딩에서는 공백과 줄바꿈이
+모두 한 바이트 ASCII 문자이므로, 파일 전체를 str 로 디코딩하지 않고
+메모리 매핑한 바이트에서 바로 합치기/공백추가를 할 수 있습니다.
+"""
+import codecs
+import mmap
+import re
+import time
+
+from converter import STREAM_CONVERTERS
+
+# 인코딩 감지에 사용할 파일 앞부분 크기 (바이트)
+SAMPLE_SIZE = 1 << 16
+# 메모리 매핑한 파일을 변환할 때 한 번에 처리하는 바이트 수
+CHUNK_BYTES = 1 << 16
+# 출력 버퍼 크기
+WRITE_BUFFER = 1 << 20
+# 매핑된 파일에서 이만큼 읽을 때마다 지나온 페이지를 돌려주어 RSS 가 파일 크기만큼 늘지 않게 합니다.
+RELEASE_BYTES = 1 << 24
+# 감지 후보 (앞에서부터 시도). CP949 는 EUC-KR 을 포함하므로 한국어 레거시 인코딩은 CP949 로 봅니다.
+# (앞부분만 보고 EUC-KR 로 정하면 뒤에 나오는 CP949 확장 글자를 디코딩하지 못합니다.)
+CANDIDATE_ENCODINGS = ('utf-8', 'cp949')
+# ASCII 가 아닌 바이트. ASCII 뿐인 부분은 어느 후보로도 디코딩되므로 인코딩을 정하는 데 쓸 수 없습니다.
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+# ASCII 외의 공백/줄바꿈 문자, \x1c-\x1f, 그리고 bytes.splitlines() 가 나누지 않는 \v, \f 의
+# 인코딩 결과를 (첫 바이트, 정확한 패턴) 으로 둡니다. 이런 바이트가 있으면 bytes 의
+# split()/strip()/splitlines() 결과가 str 과 달라지므로 디코딩해서 처리합니다.
+# 여러 패턴을 하나의 정규식으로 묶으면 매 위치마다 비교하느라 느리므로,
+# 첫 바이트가 있는지 먼저 memchr 로 확인하고 있을 때만 패턴을 검사합니다.
+_ASCII_SEPARATORS = [(bytes([b]), None) for b in (0x0b, 0x0c, 0x1c, 0x1d, 0x1e, 0x1f)]
+_KS_X_1001 = _ASCII_SEPARATORS + [(b'\xa1', re.compile(rb"\xa1\xa1"))]
+_UNSAFE_BYTES = {
+    'utf-8': _ASCII_SEPARATORS + [
+        (b'\xc2', re.compile(rb"\xc2[\x85\xa0]")),
+        (b'\xe1', re.compile(rb"\xe1\x9a\x80")),
+        (b'\xe2', re.compile(rb"\xe2(?:\x80[\x80-\x8a\xa8\xa9\xaf]|\x81\x9f)")),
+        (b'\xe3', re.compile(rb"\xe3\x80\x80")),
+    ],
+    'cp949': _KS_X_1001,
+    'euc_kr': _KS_X_1001,
+}
+
+
+def codec_name(encoding: str) -> str:
+    return codecs.lookup(encoding).name
+
+
+def continuation_encoding(encoding: str) -> str:
+    # 파일 중간에 이어 쓰는 부분에 쓸 인코딩. 앞에 BOM 을 붙이는 utf-8-sig 는 utf-8 로 씁니다.
+    return 'utf-8' if codec_name(encoding) == 'utf-8-sig' else encoding
+
+
+def detect_encoding(sample: bytes) -> str:
+    """
+    파일 앞부분으로 인코딩을 추측합니다. BOM 이 있으면 utf-8-sig,
+    없으면 CANDIDATE_ENCODINGS 중 처음으로 오류 없이 디코딩되는 인코딩.
+    sample 끝에서 잘린 다중 바이트 문자는 오류로 보지 않습니다.
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    for encoding in CANDIDATE_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    return 'utf-8'
+
+
+def guess_encoding(buf, start: int = 0, end: int = None):
+    """
+    buf[start:end] 의 인코딩을 추측합니다. 앞부분이 ASCII 뿐이면 처음 나오는
+    ASCII 가 아닌 바이트부터 SAMPLE_SIZE 바이트를 보고 정합니다.
+    BOM 도 ASCII 가 아닌 바이트도 없으면 알 수 없으므로 None 을 돌려줍니다.
+    """
+    end = len(buf) if end is None else end
+    if buf[start:start + len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+        return 'utf-8-sig'
+    for lo in range(start, end, RELEASE_BYTES):
+        hi = min(lo + RELEASE_BYTES, end)
+        found = _NON_ASCII.search(buf, lo, hi)
+        if found is not None:
+            # 중간에서 뽑은 표본이 BOM 과 같은 바이트로 시작해도 BOM 은 아닙니다.
+            return continuation_encoding(
+                detect_encoding(buf[found.start():min(found.start() + SAMPLE_SIZE, end)]))
+        _release(buf, lo, hi)
+    return None
+
+
+def sniff_encoding(path: str, default: str = 'utf-8'):
+    # 파일의 인코딩을 추측합니다. ASCII 뿐이라 알 수 없으면 default 를 돌려줍니다.
+    with MappedFile(path) as mapped:
+        return guess_encoding(mapped.data) or default
+
+
+def can_convert_bytes(buf, encoding: str, start: int = 0, end: int = None) -> bool:
+    # buf[start:end] 를 디코딩 없이 변환해도 str 로 변환한 것과 결과가 같은지
+    checks = _UNSAFE_BYTES.get(codec_name(encoding))
+    if checks is None:
+        return False
+    end = len(buf) if end is None else end
+    # RELEASE_BYTES 단위로 나누어 검사하고 지나온 페이지는 바로 내립니다.
+    # 찾는 패턴이 최대 3 바이트이므로 구간을 2 바이트씩 겹칩니다.
+    for lo in range(start, end, RELEASE_BYTES):
+        hi = min(lo + RELEASE_BYTES + 2, end)
+        for lead, pattern in checks:
+            if buf.find(lead, lo, hi) < 0:
+                continue
+            if pattern is None or pattern.search(buf, lo, hi):
+                _release(buf, lo, hi)
+                return False
+        _release(buf, lo, hi)
+    return True
+
+
+class MappedFile:
+    """
+    파일을 읽기 전용으로 메모리 매핑합니다. 빈 파일은 매핑할 수 없으므로 b'' 를 씁니다.
+    with 문으로 사용하며 .data 에 매핑된 버퍼가 들어 있습니다.
+    """
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.data = b''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+
+def _release(buf, start: int, end: int):
+    # 매핑된 파일의 [start, end) 페이지를 프로세스 메모리에서 내립니다. (다시 읽으면 페이지 캐시에서 가져옴)
+    if not isinstance(buf, mmap.mmap) or not hasattr(mmap, 'MADV_DONTNEED'):
+        return
+    start -= start % mmap.PAGESIZE
+    if end > start:
+        buf.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+
+def _byte_chunks(buf, start: int, end: int, size: int = CHUNK_BYTES):
+    released = start
+    for i in range(start, end, size):
+        yield buf[i:min(i + size, end)]
+        if i - released >= RELEASE_BYTES:
+            _release(buf, released, i)
+            released = i
+    _release(buf, released, end)
+
+
+def _checked_chunks(buf, start: int, end: int, encoding: str, size: int = CHUNK_BYTES):
+    # 디코딩 없이 변환할 바이트도 encoding 에 맞는지 확인하며 내보냅니다. 맞지 않으면 UnicodeDecodeError
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in _byte_chunks(buf, start, end, size):
+        decoder.decode(chunk)
+        yield chunk
+    decoder.decode(b'', final=True)
+
+
+def _decoded_chunks(buf, start: int, end: int, encoding: str, size: int = CHUNK_BYTES):
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in _byte_chunks(buf, start, end, size):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def read_text(path: str, encoding: str = None):
+    """
+    파일을 메모리 매핑하여 str 로 읽습니다. encoding 이 없으면 감지합니다.
+    (텍스트, 사용한 인코딩) 을 돌려줍니다.
+    """
+    with MappedFile(path) as mapped:
+        data = mapped.data
+        if encoding is None:
+            encoding = guess_encoding(data) or 'utf-8'
+        # 디코딩 결과를 조각으로 모은 뒤 한 번만 이어 붙입니다.
+        return ''.join(_decoded_chunks(data, 0, len(data), encoding)), encoding
+
+
+def convert_file(src: str, dst: str, operation: str, encoding: str = None,
+                 output_encoding: str = None, start: int = 0, end: int = None):
+    """
+    src 의 [start, end) 바이트를 operation 으로 변환하여 dst 에 씁니다.
+    encoding 이 없으면 감지하고, output_encoding 이 없으면 입력과 같은 인코딩으로 씁니다.
+    가능하면 디코딩 없이 바이트 그대로 변환합니다.
+    {'encoding', 'output_encoding', 'bytes_written', 'bytes_path', 'seconds'} 를 돌려줍니다.
+    """
+    began = time.perf_counter()
+    with MappedFile(src) as mapped:
+        data = mapped.data
+        end = len(data) if end is None else end
+        if encoding is None:
+            encoding = guess_encoding(data, start, end) or 'utf-8'
+        output_encoding = output_encoding or encoding
+        # 파일 중간부터는 BOM 이 없으므로 읽을 때 맨 앞의 U+FEFF 를 BOM 으로 보아 버리지 않고,
+        # 그 결과는 다른 결과 뒤에 이어 붙이므로 쓸 때도 BOM 을 쓰지 않습니다.
+        reader_encoding = continuation_encoding(encoding) if start else encoding
+        writer_encoding = continuation_encoding(output_encoding) if start else output_encoding
+        convert = STREAM_CONVERTERS[operation]
+        bytes_path = (codec_name(encoding) == codec_name(output_encoding)
+                      and can_convert_bytes(data, encoding, start, end))
+        written = 0
+        with open(dst, 'wb', buffering=WRITE_BUFFER) as out:
+            if bytes_path:
+                for piece in convert(_checked_chunks(data, start, end, encoding)):
+                    written += out.write(piece)
+            else:
+                encoder = codecs.getincrementalencoder(writer_encoding)()
+                for piece in convert(_decoded_chunks(data, start, end, reader_encoding)):
+                    written += out.write(encoder.encode(piece))
+                if written:
+                    # 결과가 비어 있으면 BOM 만 있는 출력을 만들지 않습니다.
+                    written += out.write(encoder.encode('', final=True))
+    return {
+        'encoding': encoding,
+        'output_encoding': output_encoding,
+        'bytes_written': written,
+        'bytes_path': bytes_path,
+        'seconds': time.perf_counter() - began,
+    }
+
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+결과 보기 창.
+변환 결과 전체를 Text 위젯에 넣으면 긴 줄(합치기 결과는 한 줄짜리 문단)에서
+Tk 가 매우 느려지므로, 결과는 ResultBuffer 에 두고 화면에 보이는 부분만 잘라 넣습니다.
+행(화면에 보이는 한 줄)은 글자 수로 어림하지 않고 Tk 가 화면 폭에 맞춰 실제로 나눈 대로 셉니다.
+전체선택 후 복사는 위젯에 든 부분이 아니라 버퍼 전체를 복사합니다.
+비례 글꼴에서는 글자마다 폭이 달라(한글은 '0' 의 약 두 배) 글자 수로 어림하면 화면과 어긋납니다.
+"""
+import tkinter as tk
+
+from resultbuffer import ResultBuffer
+
+# 마우스 휠 한 칸에 움직이는 행 수
+WHEEL_ROWS = 3
+
+
+class ResultViewer(tk.Frame):
+    def __init__(self, master, font, **kwargs):
+        super().__init__(master, **kwargs)
+        self.font = font
+        self.text = tk.Text(self, wrap=tk.WORD, font=font, state=tk.DISABLED)
+        self.scrollbar = tk.Scrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.buffer = ResultBuffer()
+        self.top = 0           # 화면 맨 위 행의 시작 위치 (버퍼 안 글자 위치)
+        self._line = None      # 최근에 찾은 줄 (시작, 끝) - 긴 줄에서 반복 탐색을 피함
+        self._pending = False
+        self._page_rows = 1    # 마지막으로 그렸을 때 화면에 보인 행 수
+        self._all_selected = False  # 전체선택 중인지 (복사할 때 버퍼 전체를 복사)
+
+        self.text.bind('<Configure>', lambda e: self.refresh())
+        self.text.bind('<MouseWheel>', self._on_wheel)
+        self.text.bind('<Button-4>', lambda e: self.scroll_rows(-WHEEL_ROWS))
+        self.text.bind('<Button-5>', lambda e: self.scroll_rows(WHEEL_ROWS))
+        self.text.bind('<Prior>', lambda e: self.scroll_pages(-1))
+        self.text.bind('<Next>', lambda e: self.scroll_pages(1))
+        self.text.bind('<Button-1>', self._on_click)
+        self.text.bind('<<SelectAll>>', self._on_select_all)
+        self.text.bind('<<Copy>>', self._on_copy)
+
+    # --- 버퍼 ---
+
+    def set_buffer(self, buffer: ResultBuffer):
+        self.buffer = buffer
+        self.top = 0
+        self._line = None
+        self._all_selected = False
+        self.refresh()
+
+    def clear(self):
+        self.set_buffer(ResultBuffer())
+
+    def copy_all(self):
+        # 결과 전체를 버퍼에서 조각 단위로 클립보드에 복사 (Text 위젯 내용처럼 끝에 줄바꿈을 붙임)
+        self.clipboard_clear()
+        for chunk in self.buffer.chunks():
+            self.clipboard_append(chunk)
+        self.clipboard_append("\n")
+
+    def replace(self, start: int, length: int, text: str):
+        # 버퍼 일부를 고치고 보이는 부분만 다시 그립니다.
+        self.buffer.replace(start, start + length, text)
+        self._line = None
+        self.top = self._align(min(self.top, len(self.buffer)))
+        self.refresh()
+
+    # --- 행 계산 ---
+
+    def _max_cols(self) -> int:
+        # 한 행에 들어갈 수 있는 최대 글자 수 (좁은 글자 기준) - 잘라 넣을 범위를 정할 때만 씁니다.
+        narrow = min(self.font.measure(c) for c in ".il'| ")
+        return max(1, self.text.winfo_width() // max(1, narrow))
+
+    def _rows(self) -> int:
+        return max(1, self.text.winfo_height() // max(1, self.font.metrics('linespace')))
+
+    def _chars(self, index1: str, index2: str) -> int:
+        counted = self.text.count(index1, index2, "chars")
+        return counted[0] if counted else 0
+
+    def _line_span(self, pos: int):
+        line = self._line
+        if line is None or not (line[0] <= pos <= line[1]):
+            line = self._line = (self.buffer.line_start(pos), self.buffer.line_end(pos))
+        return line
+
+    def _measure(self, start: int, end: int):
+        """
+        버퍼의 [start, end) 를 위젯에 넣어 Tk 가 나눈 행들의 시작 위치를 돌려줍니다.
+        위젯 내용이 바뀌므로 다시 그리도록 예약합니다. (그리기 전이라 화면에는 보이지 않음)
+        """
+        window = self.buffer.slice(start, end)
+        text = self.text
+        text.config(state=tk.NORMAL)
+        text.delete("1.0", tk.END)
+        text.insert("1.0", window)
+        text.config(state=tk.DISABLED)
+        self.refresh()
+        starts = [start]
+        index, offset = "1.0", 0
+        while True:
+            following = text.index(f"{index} + 1 display lines")
+            if not text.compare(following, '>', index):
+                break
+            offset += self._chars(index, following)
+            if offset >= len(window):
+                break
+            starts.append(start + offset)
+            index = following
+        return starts
+
+    def _rows_after(self, pos: int, count: int) -> int:
+        # pos 에서 시작하는 행부터 count 행 아래 행의 시작 위치 (버퍼 끝을 넘지 않음)
+        size = self._max_cols() * (count + 1)
+        while True:
+            starts = self._measure(pos, pos + size)
+            if len(starts) > count:
+                return starts[count]
+            if pos + size >= len(self.buffer):
+                return starts[-1]
+            size *= 2
+
+    def _rows_before(self, pos: int, count: int):
+        """
+        pos 바로 앞까지의 행 시작 위치 중 마지막 count 개.
+        줄 시작이 가까우면 줄 시작부터 나누어 화면에 그렸을 때와 같은 행이 되게 합니다.
+        아주 긴 줄 중간에서는 pos 앞의 일부만 나누어 봅니다.
+        """
+        size = self._max_cols() * (count + 1)
+        while True:
+            begin = max(0, pos - size)
+            line_start = self._line_span(begin)[0]
+            if begin - line_start <= size:
+                begin = line_start
+            starts = self._measure(begin, pos)
+            if begin != line_start:
+                # 중간에서 시작했으므로 첫 위치는 행 시작이 아닐 수 있음
+                starts = starts[1:]
+            if len(starts) >= count or begin == line_start:
+                return starts[-count:] or [begin]
+            size *= 2
+
+    def _align(self, pos: int) -> int:
+        # pos 가 들어 있는 행의 시작 위치
+        return self._rows_before(min(pos + 1, len(self.buffer)), 1)[-1] if pos else 0
+
+    def scroll_rows(self, count: int):
+        if not count or not len(self.buffer):
+            return "break"
+        if count > 0:
+            top = self._rows_after(self.top, count)
+        else:
+            top = self._rows_before(self.top, -count)[0] if self.top else 0
+        if top != self.top:
+            self.top = top
+            self.refresh()
+        return "break"
+
+    def scroll_pages(self, count: int):
+        # 화면에 실제로 보인 행 수만큼 움직입니다. (맨 아래 행은 다음 쪽 맨 위에 다시 보임)
+        if self._pending:
+            self._render()
+        return self.scroll_rows(count * self._page_rows)
+
+    # --- 그리기 ---
+
+    def refresh(self):
+        # 같은 이벤트 처리 중 여러 번 불려도 한 번만 그리도록 미룹니다.
+        if not self._pending:
+            self._pending = True
+            self.after_idle(self._render)
+
+    def _render(self):
+        self._pending = False
+        # 한 행에 최대 _max_cols() 글자가 들어가므로 rows * cols 글자면 화면을 채우고 남습니다.
+        window = self.buffer.slice(self.top, self.top + self._rows() * self._max_cols() * 2)
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", window)
+        if self._all_selected:
+            self.text.tag_add('sel', "1.0", tk.END)
+        self.text.config(state=tk.DISABLED)
+        total = len(self.buffer)
+        if not total:
+            self.scrollbar.set(0, 1)
+            return
+        height = self.text.winfo_height()
+        # 맨 아래(일부만 보일 수 있는) 행 앞까지가 한 쪽
+        rows = self.text.count("1.0", f"@0,{height}", "displaylines")
+        self._page_rows = max(1, rows[0] if rows else 0)
+        shown = self.text.count("1.0", f"@0,{height} lineend", "chars")
+        shown = shown[0] if shown else len(window)
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + shown) / total))
+
+    def _on_click(self, event):
+        # 클릭하면 전체선택이 풀리고 보이는 부분에서 새로 선택합니다.
+        self._all_selected = False
+        self.text.focus_set()
+
+    def _on_select_all(self, event):
+        self._all_selected = True
+        self.text.tag_add('sel', "1.0", tk.END)
+        return "break"
+
+    def _on_copy(self, event):
+        # 전체선택 중이 아니면 Text 기본 동작으로 보이는 부분의 선택만 복사합니다.
+        if not self._all_selected:
+            return None
+        self.copy_all()
+        return "break"
+
+    def _on_wheel(self, event):
+        return self.scroll_rows(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS)
+
+    def _on_scrollbar(self, *args):
+        if args[0] == 'moveto':
+            total = len(self.buffer)
+            pos = min(max(int(float(args[1]) * total), 0), max(total - 1, 0))
+            self.top = self._align(pos)
+            self.refresh()
+        elif args[0] == 'scroll':
+            count = int(args[1])
+            if args[2] == 'pages':
+                self.scroll_pages(count)
+            else:
+                self.scroll_rows(count)
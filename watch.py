@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+폴더 감시(tail) 모드. 입력 파일이 새로 생기거나 뒤에 내용이 덧붙으면
+새로 붙은 줄만 변환하여 짝이 되는 출력 파일 뒤에 이어 씁니다.
+
+파일마다 어디까지 변환했는지(바이트 위치)와 그때의 출력 파일 크기를 체크포인트 파일에 기록합니다.
+다시 시작하면 체크포인트부터 이어 가며, 중단되어 출력 뒤에 덧붙다 만 부분은 잘라내고 다시 씁니다.
+아직 줄바꿈으로 끝나지 않은 마지막 줄은 변환 결과를 출력 뒤에 임시로 써 두고 체크포인트에는 넣지 않아,
+줄이 더 이어지면 그 줄만 다시 변환합니다.
+줄 경계에서 나눈 조각들의 변환 결과는 구분자로 이어 붙이면 전체 결과와 같으므로
+(batch.py 의 조각 병렬 변환과 같은 원리) 출력은 전체를 다시 변환한 것과 같습니다.
+"""
+import codecs
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import batch
+import textfile
+from converter import SEPARATORS
+
+# 체크포인트 파일 기본 이름
+DEFAULT_STATE = ".textconverter-watch.json"
+# 폴더를 다시 확인하는 주기 (초)
+DEFAULT_INTERVAL = 1.0
+STATE_VERSION = 1
+# 마지막 줄바꿈을 찾을 때 파일 끝에서부터 한 번에 읽는 바이트 수
+TAIL_BLOCK = 1 << 16
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class CheckpointStore:
+    """
+    파일별 체크포인트를 JSON 파일 하나에 보관합니다. save() 는 임시 파일에 쓴 뒤 바꿔치기하므로
+    저장 도중 중단되어도 이전 체크포인트가 남습니다.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.files = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != STATE_VERSION:
+                raise ValueError(f"체크포인트 형식이 다릅니다: {path}")
+            self.files = data.get('files', {})
+
+    def get(self, src: str):
+        return self.files.get(os.path.abspath(src))
+
+    def set(self, src: str, entry):
+        self.files[os.path.abspath(src)] = entry
+
+    def save(self):
+        folder = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(self.path) + '.', dir=folder)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': STATE_VERSION, 'files': self.files}, f,
+                          ensure_ascii=False, indent=1)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            _remove(tmp)
+            raise
+
+
+def last_line_end(path: str, start: int, end: int) -> int:
+    """
+    path 의 [start, end) 바이트에서 마지막 줄바꿈 바로 다음 위치. 줄바꿈이 없으면 start.
+    맨 끝의 '\\r' 은 뒤에 '\\n' 이 붙을 수 있으므로 줄 끝으로 보지 않습니다.
+    """
+    with open(path, 'rb') as f:
+        pos = end
+        while pos > start:
+            lo = max(start, pos - TAIL_BLOCK)
+            f.seek(lo)
+            block = f.read(pos - lo)
+            k = max(block.rfind(b'\n'),
+                    block.rfind(b'\r', 0, len(block) - 1 if pos == end else len(block)))
+            if k >= 0:
+                return lo + k + 1
+            pos = lo
+    return start
+
+
+def _record(src: str, dst: str, status: str, bytes_in: int = 0, bytes_out: int = 0,
+            seconds: float = 0.0, error: str = ''):
+    return {'input': src, 'output': dst, 'status': status, 'bytes_in': bytes_in,
+            'bytes_out': bytes_out, 'seconds': round(seconds, 4), 'error': error}
+
+
+class Watcher:
+    """
+    paths (파일, 글롭 패턴, 폴더) 를 감시하며 새로 붙은 줄만 operation 으로 변환합니다.
+    poll() 한 번이 한 차례 확인이며, 바뀐 파일마다 요약 dict 를 돌려줍니다.
+    """
+    def __init__(self, paths, operation: str, output_dir: str = None,
+                 name_template: str = batch.DEFAULT_NAME_TEMPLATE,
+                 pattern: str = batch.DEFAULT_PATTERN, encoding: str = None,
+                 output_encoding: str = None, state_path: str = DEFAULT_STATE):
+        self.paths = paths
+        self.operation = operation
+        self.output_dir = output_dir
+        self.name_template = name_template
+        self.pattern = pattern
+        self.encoding = encoding
+        self.output_encoding = output_encoding
+        self.store = CheckpointStore(state_path)
+
+    def _targets(self):
+        # (입력, 출력) 목록. 출력 파일(다른 변환 종류나 출력 폴더로 감시했을 때의 출력 포함)과
+        # 체크포인트 파일은 입력으로 보지 않습니다.
+        found = batch.expand_inputs(self.paths, self.pattern)
+        exclude = [e['output'] for e in self.store.files.values()] + [self.store.path]
+        return [(src, batch.output_path(src, rel, self.operation, self.output_dir, self.name_template))
+                for src, rel in batch.without_outputs(found, self.output_dir, self.name_template,
+                                                      exclude)]
+
+    def poll(self):
+        records = []
+        for src, dst in self._targets():
+            try:
+                record = self._update(src, dst)
+            except (OSError, UnicodeError, ValueError) as e:
+                record = _record(src, dst, 'failed', error=str(e))
+            if record:
+                records.append(record)
+        return records
+
+    def _new_entry(self, src: str, dst: str, stat):
+        # 인코딩을 지정하지 않았으면 None 으로 두고 _update 에서 내용을 보고 정합니다.
+        return {
+            'output': os.path.abspath(dst),
+            'operation': self.operation,
+            'encoding': self.encoding,
+            'output_encoding': self.output_encoding or self.encoding,
+            'inode': stat.st_ino,
+            'size': 0,
+            'mtime_ns': 0,
+            'offset': 0,          # 여기까지의 입력을 변환함 (항상 줄 경계)
+            'output_bytes': 0,    # 그때의 출력 파일 크기
+            'partial': 0,         # 줄바꿈으로 끝나지 않은 마지막 줄의 바이트 수 (출력은 임시로 씀)
+        }
+
+    def _update(self, src: str, dst: str):
+        stat = os.stat(src)
+        entry = self.store.get(src)
+        status = 'append'
+        if (entry is None or entry['operation'] != self.operation
+                or entry['output'] != os.path.abspath(dst)):
+            entry, status = self._new_entry(src, dst, stat), 'new'
+        elif (stat.st_ino != entry['inode'] or stat.st_size < entry['offset']
+              or not os.path.exists(dst) or os.path.getsize(dst) < entry['output_bytes']):
+            # 입력이 다른 파일로 바뀌었거나 줄어들었거나, 출력이 지워지거나 잘렸으면 처음부터 다시 변환
+            entry, status = self._new_entry(src, dst, stat), 'reset'
+        elif stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']:
+            return None
+        if entry.get('error'):
+            return None
+
+        began = time.perf_counter()
+        start, committed = entry['offset'], entry['output_bytes']
+        end = last_line_end(src, start, stat.st_size)
+        encoding = entry['encoding'] or self._guess_encoding(src, entry, start, end, stat.st_size)
+        output_encoding = entry['output_encoding'] or encoding
+        if not batch.is_ascii_compatible(encoding):
+            # 줄 경계를 바이트로 찾을 수 없는 인코딩 (UTF-16 등)
+            entry['error'] = f"이어서 변환할 수 없는 인코딩: {encoding}"
+            self.store.set(src, entry)
+            self.store.save()
+            return _record(src, dst, 'failed', error=entry['error'])
+        os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+        with open(dst, 'r+b' if os.path.exists(dst) else 'wb') as out:
+            # 체크포인트 이후에 쓴 부분(지난번의 끝나지 않은 줄, 중단되어 덧붙다 만 부분)을 지웁니다.
+            out.truncate(committed)
+            out.seek(committed)
+            committed += self._append(out, src, entry['output'], encoding, output_encoding,
+                                      start, end, committed)
+            # 끝나지 않은 마지막 줄도 변환해 두지만 체크포인트에는 넣지 않고 다음에 다시 변환합니다.
+            # 그 줄이 아직 덜 쓰인 다중 바이트 글자로 끝나 디코딩할 수 없으면 이번에는 건너뜁니다.
+            try:
+                partial = self._append(out, src, entry['output'], encoding, output_encoding,
+                                       end, stat.st_size, committed)
+            except UnicodeDecodeError:
+                partial = 0
+            out.flush()
+            os.fsync(out.fileno())
+        written = committed + partial - entry['output_bytes']
+        entry.update(offset=end, size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+                     output_bytes=committed, partial=stat.st_size - end)
+        self.store.set(src, entry)
+        self.store.save()
+        return _record(src, dst, status, stat.st_size - start, written, time.perf_counter() - began)
+
+    def _guess_encoding(self, src: str, entry, start: int, end: int, size: int) -> str:
+        """
+        지금까지 ASCII 뿐이라 인코딩을 정하지 못한 파일에서, 새로 붙은 완성된 줄 [start, end) 로
+        인코딩을 추측합니다. 정해지면 entry 에 기록하고, 아직 ASCII 뿐이면 기록하지 않고 다음에 다시 봅니다.
+        끝나지 않은 줄은 다중 바이트 글자가 덜 쓰였을 수 있으므로 이번 변환에만 씁니다.
+        """
+        with textfile.MappedFile(src) as mapped:
+            encoding = textfile.guess_encoding(mapped.data, start, end)
+            if encoding is None:
+                return textfile.guess_encoding(mapped.data, end, size) or 'utf-8'
+        entry.update(encoding=encoding, output_encoding=entry['output_encoding'] or encoding)
+        return encoding
+
+    def _append(self, out, src: str, output: str, encoding: str, output_encoding: str,
+                start: int, end: int, before: int) -> int:
+        """
+        src 의 [start, end) 를 변환하여 out (경로 output) 에 이어 씁니다. 쓴 바이트 수를 돌려줍니다.
+        before 는 out 에 이미 있는 출력 크기이며, 0 이 아니면 구분자를 먼저 씁니다.
+        """
+        if start >= end:
+            return 0
+        folder = os.path.dirname(output) or '.'
+        fd, part = tempfile.mkstemp(prefix='.' + os.path.basename(output) + '.',
+                                    suffix='.part', dir=folder)
+        os.close(fd)
+        try:
+            result = textfile.convert_file(src, part, self.operation, encoding,
+                                           output_encoding, start, end)
+            if not result['bytes_written']:
+                return 0
+            written = 0
+            if before:
+                written += out.write(SEPARATORS[self.operation].encode(
+                    textfile.continuation_encoding(output_encoding)))
+            elif start and textfile.codec_name(output_encoding) == 'utf-8-sig':
+                # 앞부분의 결과가 비어 있어 이번 결과가 파일 맨 앞이 되는 경우
+                written += out.write(codecs.BOM_UTF8)
+            with open(part, 'rb') as f:
+                shutil.copyfileobj(f, out, batch.COPY_SIZE)
+            return written + result['bytes_written']
+        finally:
+            _remove(part)
+
+    def run(self, interval: float = DEFAULT_INTERVAL, once: bool = False, report=None):
+        # interval 초마다 poll() 합니다. once 이면 한 번만 확인하고 돌아옵니다.
+        report = report or (lambda record: None)
+        while True:
+            for record in self.poll():
+                report(record)
+            if once:
+                return
+            time.sleep(interval)
+
+
+def print_record(record, file=sys.stdout):
+    line = f"[{record['status']}] {record['input']} -> {record['output']}"
+    if record['status'] == 'failed':
+        line += f" : {record['error']}"
+    else:
+        line += f" (+{record['bytes_in']} -> +{record['bytes_out']} bytes, {record['seconds']:.3f}s)"
+    print(line, file=file, flush=True)